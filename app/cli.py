@@ -0,0 +1,298 @@
+import argparse
+import fnmatch
+import os
+import sys
+
+from app.config import Config
+from app.data.project import project_list
+from app.services.blender_pool import BlenderPool
+from app.services.blender_settings import BATCH_LIGHTING_SCRIPT
+from app.services.job_journal import JobJournal
+from app.services.job_logs import JobLogs
+from app.services.json_manager import JSONManager
+from app.services.preflight import Preflight
+from app.services.progress_copy import PROGRESS_COPY_MODES, ProgressCopier
+from app.services.shot_builder import ShotBuilder
+from app.services.shot_fingerprint import ShotFingerprints
+from app.services.shot_index import ShotIndex, ShotListError, ShotRecord
+from app.services.timing_report import TimingReport
+
+# Headless entry point, no Qt import:
+#   python -m app.cli generate --csv shots.csv --project Rimba --shot "rmb_ep01_*"
+#   python -m app.cli apply-preset --csv shots.csv --project Rimba --workers 8 --dry-run
+# Unset options fall back to the 'shot_generator' section of the GUI config; switches the config
+# turns on can be turned off again with their --no- form, e.g. --no-batch.
+
+
+def _find_project(name: str) -> list | None:
+    name = (name or "").lower()
+    return next((p for p in project_list if name in (p[0].lower(), p[1].lower(), p[2].lower())), None)
+
+
+def _matches(shot_file: str, patterns: list[str]) -> bool:
+    if not patterns:
+        return True
+    return any(fnmatch.fnmatch(shot_file.lower(), pattern.lower()) for pattern in patterns)
+
+
+def _select_shots(builder: ShotBuilder, csv_path: str, patterns: list[str]) -> list[ShotRecord]:
+    shot_index = ShotIndex.from_csv(builder.project_code, csv_path)
+    selected = []
+    for record in shot_index:
+        # Duplicated CSV rows resolve to the first record, like the GUI lookup
+        if _matches(record.file_name, patterns) and shot_index.get(record.file_name) is record:
+            selected.append(record)
+    return selected
+
+
+def _preflight(args, batch_checks: list, shots: list[dict], shot_checks, dropped: list[str]) -> list[dict] | None:
+    # Returns the shots that passed, or None when a batch-wide input is unusable; failed shots go to dropped
+    # Blender is not launched on a dry run, so its path is not checked there
+    if args.dry_run:
+        batch_checks = [check for check in batch_checks if check[0] != "Blender executable"]
+    report = Preflight().run(batch_checks, {shot["name"]: shot_checks(shot) for shot in shots})
+    if report.batch_problems:
+        print("[ERROR] Pre-flight check failed:\n" + report.format())
+        return None
+    if report.shot_problems:
+        print(f"[WARNING] Skipping {len(report.shot_problems)} shot(s) that failed the pre-flight check:\n"
+              + report.format())
+        dropped.extend(report.shot_problems)
+    return [shot for shot in shots if shot["name"] not in report.shot_problems]
+
+
+def _materialise_dirs(args, builder: ShotBuilder, shots: list[dict], output_dirs,
+                      dropped: list[str]) -> list[dict]:
+    # Output folders are created only now, for the shots that will actually run
+    if args.dry_run:
+        return shots
+    failed_dirs = builder.materialise_dirs(shots, output_dirs)
+    for name, error in failed_dirs.items():
+        print(f"[WARNING] Skipping {name}: {error}")
+    dropped.extend(failed_dirs)
+    return [shot for shot in shots if shot["name"] not in failed_dirs]
+
+
+def _exit_code(status: int, dropped: list[str]) -> int:
+    # Shots dropped before the run fail the command too, so unattended runs do not report success
+    if dropped:
+        print(f"[ERROR] {len(dropped)} shot(s) were skipped before the run")
+        return status or 1
+    return status
+
+
+def _skip_completed(journal: JobJournal, shots: list[dict], probe_jobs) -> list[dict]:
+    # probe_jobs: the shots' single-shot jobs, built without a copier only to compare with the journal
+    done = journal.completed(probe_jobs)
+    if done:
+        print(f"Resuming: skipping {len(done)} shot(s) already complete and up to date")
+    return [shot for shot in shots if shot["name"] not in done]
+
+
+def _run_jobs(args, jobs: list[tuple[str, str, dict]], copier: ProgressCopier | None = None,
+              journal: JobJournal | None = None) -> int:
+    if not jobs:
+        print("No shots to process")
+        return 0
+    if args.dry_run:
+        print(f"[DRY RUN] {len(jobs)} job(s) would run")
+        return 0
+
+    pool = BlenderPool(blender_path=args.blender, max_workers=args.workers, persistent=args.persistent,
+                       retries=args.retries, retry_backoff=args.retry_backoff, timeout=args.timeout)
+    timing = TimingReport()
+    JobLogs.prune()
+    logs = JobLogs()
+    results = pool.run(jobs, on_success=copier, timing=timing, logs=logs, journal=journal)
+    failed = [name for name, ok in results.items() if not ok]
+    print(f"Finished: {len(results) - len(failed)} succeeded, {len(failed)} failed")
+    for name in failed:
+        print(f"  FAILED {name}")
+    print(f"Logs: {logs.batch_dir}")
+    print(timing.format())
+    if args.timing_report:
+        timing.save(args.timing_report)
+        print(f"Timing records written to {args.timing_report}")
+    return 1 if failed else 0
+
+
+def cmd_generate(args, builder: ShotBuilder) -> int:
+    if not args.mastershot:
+        print("[ERROR] --mastershot is required")
+        return 2
+    apply_preset = args.apply_preset
+    dropped = []
+
+    records = {record.file_name: record for record in _select_shots(builder, args.csv, args.shot)}
+    shots = _preflight(args,
+                       builder.batch_preflight(args.blender, mastershot_path=args.mastershot,
+                                               blend_preset_filepath=args.preset_blend if apply_preset else "",
+                                               json_preset_filepath=args.preset_json if apply_preset else ""),
+                       [builder.lighting_shot(record) for record in records.values()],
+                       builder.lighting_preflight, dropped)
+    if shots is None:
+        return 2
+
+    # Single-shot jobs built without a copier, only to fingerprint the shots and compare with the journal
+    probe_jobs = [builder.lighting_job(shot, mastershot_path=args.mastershot, link=not args.append,
+                                       apply_preset=apply_preset, blend_preset_filepath=args.preset_blend,
+                                       json_preset_filepath=args.preset_json) for shot in shots]
+    fingerprints = ShotFingerprints()
+    for job in probe_jobs:
+        fingerprints.add(job, records[job[0]], script=BATCH_LIGHTING_SCRIPT if args.batch else None)
+    if args.only_changed:
+        unchanged = fingerprints.unchanged()
+        if unchanged:
+            print(f"Only changed: skipping {len(unchanged)} shot(s) whose inputs have not changed")
+        shots = [shot for shot in shots if shot["name"] not in unchanged]
+        probe_jobs = [job for job in probe_jobs if job[0] not in unchanged]
+
+    journal = JobJournal(on_done=fingerprints.write)
+    if args.resume:
+        shots = _skip_completed(journal, shots, probe_jobs)
+    shots = _materialise_dirs(args, builder, shots, builder.lighting_output_dirs, dropped)
+
+    copier = ProgressCopier(args.progress_copy)
+    jobs = []
+    batch_shots = []
+    for shot_data in shots:
+        shot_file = shot_data["name"]
+        if args.dry_run:
+            print(f"[DRY RUN] {shot_file}: {shot_data['animation_file']} -> {shot_data['output_path']} "
+                  f"(frames {shot_data['start_frame']}-{shot_data['end_frame']})")
+        if args.batch:
+            batch_shots.append(shot_data)
+            continue
+        jobs.append(builder.lighting_job(shot_data, mastershot_path=args.mastershot, link=not args.append,
+                                         apply_preset=apply_preset, blend_preset_filepath=args.preset_blend,
+                                         json_preset_filepath=args.preset_json, copier=copier))
+
+    if batch_shots:
+        workers = args.workers if args.workers > 0 else BlenderPool.default_workers()
+        jobs = builder.batch_jobs(batch_shots, workers=workers, mastershot_path=args.mastershot,
+                                  link=not args.append, apply_preset=apply_preset,
+                                  blend_preset_filepath=args.preset_blend, json_preset_filepath=args.preset_json,
+                                  copier=copier)
+    return _exit_code(_run_jobs(args, jobs, copier, journal), dropped)
+
+
+def cmd_apply_preset(args, builder: ShotBuilder) -> int:
+    if not args.preset_blend or not args.preset_json:
+        print("[ERROR] --preset-blend and --preset-json are required")
+        return 2
+    dropped = []
+
+    shots = _preflight(args,
+                       builder.batch_preflight(args.blender, blend_preset_filepath=args.preset_blend,
+                                               json_preset_filepath=args.preset_json),
+                       builder.apply_preset_shots(_select_shots(builder, args.csv, args.shot)),
+                       builder.apply_preset_preflight, dropped)
+    if shots is None:
+        return 2
+
+    journal = JobJournal()
+    if args.resume:
+        shots = _skip_completed(journal, shots, (
+            builder.apply_preset_job(shot, blend_preset_filepath=args.preset_blend,
+                                     json_preset_filepath=args.preset_json) for shot in shots))
+    shots = _materialise_dirs(args, builder, shots, builder.apply_preset_output_dirs, dropped)
+
+    if not args.dry_run:
+        failed = builder.reserve_progress_versions(shots)
+        for name, error in failed.items():
+            print(f"[WARNING] Skipping {name}: {error}")
+        dropped.extend(failed)
+        shots = [shot for shot in shots if shot["name"] not in failed]
+
+    copier = ProgressCopier(args.progress_copy)
+    jobs = []
+    for shot_data in shots:
+        shot_file = shot_data["name"]
+        if args.dry_run:
+            print(f"[DRY RUN] {shot_file}: {shot_data['lighting_file']} -> {shot_data['output_path_progress']}")
+        jobs.append(builder.apply_preset_job(shot_data, blend_preset_filepath=args.preset_blend,
+                                             json_preset_filepath=args.preset_json, copier=copier))
+    try:
+        return _exit_code(_run_jobs(args, jobs, copier, journal), dropped)
+    finally:
+        if not args.dry_run:
+            builder.release_progress_versions(shots)
+
+
+def build_parser(defaults: dict) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Shot Builder Blend Comp (headless)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--csv", default=defaults.get("csv_path", ""), help="Shot list CSV (EP, SEQ, SHOT, START, END)")
+    common.add_argument("--project", default=defaults.get("project", ""), help="Project name or code")
+    common.add_argument("--blender", default=defaults.get("blender_path", ""), help="Blender executable")
+    common.add_argument("--shot", action="append", default=[],
+                        help="Glob on the lighting file name, e.g. 'rmb_ep01_sq010_*'. Repeatable.")
+    common.add_argument("--workers", type=int, default=defaults.get("max_workers", 0),
+                        help="Concurrent Blender processes (0 = from CPU count and free memory)")
+    common.add_argument("--persistent", action=argparse.BooleanOptionalAction, default=defaults.get("persistent_workers", False),
+                        help="Keep one Blender worker alive per pool slot")
+    common.add_argument("--retries", type=int, default=defaults.get("job_retries", Config.BLENDER_JOB_RETRIES),
+                        help="Retry a failed job this many times, with exponential backoff")
+    common.add_argument("--retry-backoff", type=float,
+                        default=defaults.get("job_retry_backoff", Config.BLENDER_JOB_RETRY_BACKOFF),
+                        help="Seconds before the first retry; doubled for each further retry")
+    common.add_argument("--timeout", type=float, default=defaults.get("job_timeout", Config.BLENDER_JOB_TIMEOUT),
+                        help="Kill a job still running after this many seconds (0 = no limit)")
+    common.add_argument("--progress-copy", choices=PROGRESS_COPY_MODES,
+                        default=defaults.get("progress_copy_mode", "save"),
+                        help="How the progress version is written: a second Blender save, or a verified "
+                             "copy/reflink/hardlink of the saved file")
+    common.add_argument("--preset-blend", default=defaults.get("lighting_preset_blend", ""))
+    common.add_argument("--preset-json", default=defaults.get("lighting_preset_json", ""))
+    common.add_argument("--resume", action="store_true",
+                        help="Skip shots the job journal shows as complete, with unchanged inputs and outputs")
+    common.add_argument("--dry-run", action="store_true", help="Print the planned jobs without launching Blender")
+    common.add_argument("--timing-report", default="",
+                        help="Write every stage timing record of the batch to this JSON lines file")
+
+    generate = subparsers.add_parser("generate", parents=[common], help="Generate lighting files from the mastershot")
+    generate.add_argument("--mastershot", default=defaults.get("mastershot_path", ""))
+    generate.add_argument("--append", action=argparse.BooleanOptionalAction, default=not defaults.get("method_link", True),
+                          help="Append the camera instead of linking it")
+    generate.add_argument("--apply-preset", action=argparse.BooleanOptionalAction,
+                          default=defaults.get("lighting_preset_apply", False),
+                          help="Also append and apply the lighting preset")
+    generate.add_argument("--only-changed", action=argparse.BooleanOptionalAction, default=defaults.get("only_changed", False),
+                          help="Skip shots whose mastershot, animation file, CSV row, presets and script are "
+                               "unchanged since their lighting file was built")
+    generate.add_argument("--batch", action=argparse.BooleanOptionalAction, default=defaults.get("batch_mode", False),
+                          help="Build several shots per Blender session")
+    generate.set_defaults(func=cmd_generate)
+
+    apply_preset = subparsers.add_parser("apply-preset", parents=[common],
+                                         help="Apply the lighting preset to existing lighting files")
+    apply_preset.set_defaults(func=cmd_apply_preset)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    defaults = JSONManager.read_section(Config.CONFIG_PATH, "shot_generator")
+    args = build_parser(defaults).parse_args(argv)
+
+    project_data = _find_project(args.project)
+    if not project_data:
+        print(f"[ERROR] Unknown project: {args.project!r}")
+        return 2
+    if not args.csv or not os.path.exists(args.csv):
+        print(f"[ERROR] CSV file not found: {args.csv}")
+        return 2
+    if not args.dry_run and (not args.blender or not os.path.exists(args.blender)):
+        print(f"[ERROR] Blender executable not found: {args.blender}")
+        return 2
+
+    try:
+        return args.func(args, ShotBuilder(project_data))
+    except ShotListError as e:
+        print(f"[ERROR] Invalid shot list {args.csv}: {e}")
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
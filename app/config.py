@@ -4,4 +4,24 @@ class Config:
     CONFIG_DIR = os.path.join(os.path.expanduser('~'), '.config', 'yp-sbbc')
     CONFIG_PATH = os.path.join(CONFIG_DIR, 'config.json')
     LOG_PATH = os.path.join(CONFIG_DIR, 'logs')
-    os.makedirs(CONFIG_DIR, exist_ok=True)
\ No newline at end of file
+    # Append-only record of every shot a batch finished or failed, used to resume batches
+    JOURNAL_PATH = os.path.join(CONFIG_DIR, 'journal.jsonl')
+    # Per-batch job payloads; failed jobs' payloads are kept this many days for debugging
+    SCRATCH_PATH = os.path.join(CONFIG_DIR, 'scratch')
+    SCRATCH_KEEP_DAYS = 7
+    # Rough resident memory of one background Blender job, used to size the worker pool
+    BLENDER_JOB_MEMORY_MB = 4096
+    # Failed jobs are retried this many times, waiting BACKOFF, 2x BACKOFF, ... seconds in between
+    BLENDER_JOB_RETRIES = 1
+    BLENDER_JOB_RETRY_BACKOFF = 10.0
+    # A job running longer than this (seconds) is treated as hung and killed; 0 disables the limit
+    BLENDER_JOB_TIMEOUT = 1800
+    # Per-job Blender logs: size before a log rotates, rotated files kept, batches kept
+    LOG_MAX_BYTES = 5 * 1024 * 1024
+    LOG_BACKUP_COUNT = 2
+    LOG_KEEP_BATCHES = 50
+    # An empty progress version older than this (seconds) is a reservation left by a crashed run
+    VERSION_RESERVATION_MAX_AGE = 24 * 60 * 60
+    # GUI settings are written this many seconds after the last change
+    CONFIG_SAVE_DELAY = 0.5
+    os.makedirs(CONFIG_DIR, exist_ok=True)
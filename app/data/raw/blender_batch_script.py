@@ -0,0 +1,30 @@
+import os
+import sys
+import traceback
+
+# PARAMS (shared settings plus one record per shot) and STAGE are injected by blender_runner.py
+# or the persistent worker; each shot is built by blender_lib.py next to this script
+RAW_DIR = os.path.dirname(os.path.abspath(__file__))
+if RAW_DIR not in sys.path:
+    sys.path.insert(0, RAW_DIR)
+from blender_lib import build_lighting_shot  # noqa: E402
+
+SHOTS = PARAMS["shots"]
+APPLY_PRESET = bool(PARAMS.get("apply_preset"))
+
+failed = []
+for index, shot in enumerate(SHOTS, start=1):
+    print(f"[BATCH] ({index}/{len(SHOTS)}) Building {shot['name']}")
+    try:
+        build_lighting_shot(PARAMS, shot, apply_preset=APPLY_PRESET, stage=STAGE)
+        print(f"[BATCH] OK {shot['name']}")
+    except Exception:
+        traceback.print_exc()
+        failed.append(shot["name"])
+        print(f"[BATCH] FAILED {shot['name']}")
+
+print(f"[BATCH] Finished: {len(SHOTS) - len(failed)} succeeded, {len(failed)} failed")
+
+if failed:
+    # The runner then skips its completed sentinel, so the host marks the job failed
+    raise RuntimeError(f"{len(failed)} shot(s) failed: {', '.join(failed)}")
@@ -0,0 +1,99 @@
+import bpy
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from importlib.machinery import SourceFileLoader
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Stable entry point for every Blender job:
+#   blender --background --python-exit-code 1 --python blender_runner.py -- <payload.json>
+# payload: {"script": "<file in this folder>", "params": {...}}
+# Scripts get PARAMS and STAGE, a context manager that reports each stage's timing.
+# The shot scripts never change per job, so their bytecode is cached in __pycache__ and
+# reused by every run of the batch; only the small JSON payload differs.
+RAW_DIR = os.path.dirname(os.path.abspath(__file__))
+# Machine-readable lines on stdout start with this prefix; see ExecuteProgram and BlenderWorker
+PROTOCOL_PREFIX = "@@SBBC@@ "
+DATABLOCK_TYPES = ("objects", "collections", "meshes", "materials", "images", "node_groups", "libraries")
+_compiled = {}
+_stage_depth = 0
+
+
+def emit(payload: dict):
+    sys.stdout.write(PROTOCOL_PREFIX + json.dumps(payload) + "\n")
+    sys.stdout.flush()
+
+
+def _peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+@contextmanager
+def stage(name: str, shot: str | None = None):
+    # Times one stage of a shot script and reports it as {"event": "stage", ...}; depth > 0 marks
+    # a stage nested in another one, e.g. orphans_purge inside link_animation
+    global _stage_depth
+    depth = _stage_depth
+    _stage_depth += 1
+    started = time.perf_counter()
+    ok = True
+    try:
+        yield
+    except BaseException:
+        ok = False
+        raise
+    finally:
+        _stage_depth = depth
+        emit({
+            "event": "stage",
+            "stage": name,
+            "shot": shot,
+            "seconds": round(time.perf_counter() - started, 4),
+            "depth": depth,
+            "ok": ok,
+            "datablocks": {kind: len(getattr(bpy.data, kind, ())) for kind in DATABLOCK_TYPES},
+            "peak_rss_mb": _peak_rss_mb(),
+        })
+
+
+def load_code(script: str):
+    code = _compiled.get(script)
+    if code is None:
+        name = os.path.splitext(script)[0]
+        # SourceFileLoader reads and writes the __pycache__ .pyc like a normal import
+        code = _compiled[script] = SourceFileLoader(name, os.path.join(RAW_DIR, script)).get_code(name)
+    return code
+
+
+def run_script(script: str, params: dict):
+    # Shot scripts never quit Blender themselves; the runner or the persistent worker does
+    exec(load_code(script), {"__name__": "__sbbc_job__", "__file__": os.path.join(RAW_DIR, script),
+                             "PARAMS": params, "STAGE": stage})
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    if not argv:
+        print("[ERROR] Usage: blender --background --python blender_runner.py -- <payload.json>")
+        return
+    with open(argv[0], encoding="utf-8") as f:
+        payload = json.load(f)
+    run_script(payload["script"], payload["params"])
+    # Sentinel: the host treats a job without it as failed, whatever Blender's exit code.
+    # An exception above skips it and, with --python-exit-code, makes Blender exit non-zero.
+    emit({"event": "completed"})
+
+
+if __name__ == "__main__":
+    main()
+    bpy.ops.wm.quit_blender()
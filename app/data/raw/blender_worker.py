@@ -0,0 +1,78 @@
+import bpy
+import ctypes
+import json
+import os
+import sys
+import time
+import traceback
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from blender_runner import emit, run_script  # noqa: E402
+
+# Long-lived background worker. Reads one JSON job per line from stdin:
+#   {"id": "<job id>", "script": "<file in app/data/raw>", "params": {...}}   run a shot script
+#   {"command": "quit"}                                                        shut down
+# and answers with one protocol line (PROTOCOL_PREFIX + JSON) per event on stdout, including
+# the "stage" timing events of the running script. Everything else Blender prints is passed
+# through untouched. Each job ends with "done" (its result) and then "end", sent once all of
+# the job's output has been flushed, so the host can give every line to the right job.
+
+try:
+    # Blender's C code prints through the C runtime's stdio, which is block-buffered on a pipe
+    _libc = ctypes.CDLL("ucrtbase" if sys.platform == "win32" else None)
+except OSError:
+    _libc = None
+
+
+def _reset_session():
+    # Drop everything the previous job loaded (libraries, images, undo) before the next one
+    try:
+        bpy.ops.wm.read_homefile(use_empty=True)
+    except Exception as e:
+        print(f"[WARNING] Could not reset session: {e}")
+
+
+def _flush_output():
+    sys.stdout.flush()
+    sys.stderr.flush()
+    if _libc is not None:
+        _libc.fflush(None)
+
+
+def _run_job(job: dict) -> dict:
+    job_id = job.get("id")
+    started = time.monotonic()
+    result = {"event": "done", "id": job_id, "ok": True, "error": None}
+    try:
+        # Same loader as blender_runner.py: compiled once per worker, bytecode cached on disk
+        run_script(job["script"], job.get("params", {}))
+    except Exception:
+        result["ok"] = False
+        result["error"] = traceback.format_exc()
+        print(result["error"])
+    finally:
+        _reset_session()
+    result["elapsed"] = time.monotonic() - started
+    return result
+
+
+def main():
+    emit({"event": "ready"})
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            job = json.loads(line)
+        except ValueError as e:
+            emit({"event": "error", "error": f"Invalid job line: {e}"})
+            continue
+        if job.get("command") == "quit":
+            break
+        emit(_run_job(job))
+        _flush_output()
+        emit({"event": "end", "id": job.get("id")})
+
+
+main()
+bpy.ops.wm.quit_blender()
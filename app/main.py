@@ -1,9 +1,23 @@
+import importlib
 import sys
-from PyQt6.QtWidgets import QApplication, QMainWindow
 
-from app.modules.main.handle_apply_light_preset import ApplyLightPresetHandler
+from app.services.startup_timing import StartupTimer
+
+startup = StartupTimer()
+
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QWidget
+
 from app.ui.main_widget_ui import Ui_MainWindow
-from app.modules.main.handle_shot_generator import ShotGeneratorHandler
+
+startup.mark("import Qt and main window")
+
+# (tab title, module, handler class); a tab's module is imported when the tab is first shown
+TABS = (
+    ("Shot Generator", "app.modules.main.handle_shot_generator", "ShotGeneratorHandler"),
+    ("Apply Light Preset", "app.modules.main.handle_apply_light_preset", "ApplyLightPresetHandler"),
+)
+
 
 class MainUI(QMainWindow):
     def __init__(self):
@@ -13,14 +27,41 @@ class MainUI(QMainWindow):
         self.setWindowTitle("Shot Builder Blend Comp")
         self.ui.label_version.setText("v0.1.14")
 
-        self.ui.tabWidget_main.addTab(ShotGeneratorHandler(), "Shot Generator")
-        self.ui.tabWidget_main.addTab(ApplyLightPresetHandler(), "Apply Light Preset")
+        # Empty pages stand in for the tabs; each handler is built into its page on first activation
+        self._pending = {}
+        for title, module_name, class_name in TABS:
+            page = QWidget()
+            layout = QVBoxLayout(page)
+            layout.setContentsMargins(0, 0, 0, 0)
+            self._pending[self.ui.tabWidget_main.addTab(page, title)] = (module_name, class_name)
+        self.ui.tabWidget_main.currentChanged.connect(self._build_tab)
         # Additional UI setup can be done here
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Build the current tab once the window has been drawn, so the window appears first
+        QTimer.singleShot(0, lambda: self._build_tab(self.ui.tabWidget_main.currentIndex()))
+
+    def _build_tab(self, index: int):
+        target = self._pending.pop(index, None)
+        if target is None:
+            return
+        module_name, class_name = target
+        title = self.ui.tabWidget_main.tabText(index)
+        with startup.measure(f"{title}: import"):
+            module = importlib.import_module(module_name)
+        with startup.measure(f"{title}: build"):
+            handler = getattr(module, class_name)()
+        self.ui.tabWidget_main.widget(index).layout().addWidget(handler)
+        startup.report()
+
+
 if __name__ == '__main__':
     app = QApplication(sys.argv)
     window = MainUI()
+    startup.mark("create main window")
     window.show()
+    startup.mark("show main window")
     sys.exit(app.exec())
 
-# pyinstaller --clean --noconsole --onefile -n ShotBuilderBlendComp -p . --collect-submodules app app/main.py
+# pyinstaller --clean --noconsole --onefile -n ShotBuilderBlendComp -p . --collect-submodules app --add-data app/data/raw:app/data/raw app/main.py
@@ -1,14 +1,15 @@
-from PyQt6.QtWidgets import QWidget, QFileDialog, QMessageBox, QAbstractItemView
+from PyQt6.QtWidgets import QWidget, QFileDialog, QMessageBox
 
 from app.config import Config
-from app.services.blender_settings import BlenderSettings
-from app.services.execute_program import ExecuteProgram
-from app.services.json_manager import JSONManager
+from app.modules.main.shot_list_model import ShotLists
+from app.services.json_manager import ConfigSection, JSONManager
+from app.services.preflight import Preflight
+from app.services.progress_copy import PROGRESS_COPY_MODES, ProgressCopier
 from app.ui.apply_light_preset_ui import Ui_Form
-from app.data.project import project_list, division_list
-from app.services.csv_manager import CSVManager
+from app.data.project import project_list
 from app.services.file_manager import FileManager
-from app.data.blender_config import character_collection_name, lighting_plugin_key
+from app.services.shot_builder import ShotBuilder
+from app.services.shot_index import ShotIndex, ShotListError
 
 
 class ApplyLightPresetHandler(QWidget):
@@ -17,16 +18,22 @@ class ApplyLightPresetHandler(QWidget):
         self.ui = Ui_Form()
         self.ui.setupUi(self)
 
-        self.csv_data = None
-        self._available_widget_order = []
+        # Run options: 0 workers picks from CPU count and free memory, a 0 s timeout means no limit
+        self.ui.comboBox_progressCopy.addItems(PROGRESS_COPY_MODES)
+        self.ui.spinBox_retries.setValue(Config.BLENDER_JOB_RETRIES)
+        self.ui.doubleSpinBox_retryBackoff.setValue(Config.BLENDER_JOB_RETRY_BACKOFF)
+        self.ui.spinBox_timeout.setValue(int(Config.BLENDER_JOB_TIMEOUT))
+
+        self.shot_index = None
+        self._reserved_shots = []  # shots holding a progress version placeholder until the batch ends
+        self.batch_progress = None
+        self.config = ConfigSection(Config.CONFIG_PATH, "apply_light_preset")
 
         for project in project_list:
             self.ui.comboBox_project.addItem(project[1])
         self.ui.pushButton_scan.clicked.connect(self.on_scan_files)
-        self.ui.listWidget_available.setSelectionMode(QAbstractItemView.SelectionMode.MultiSelection)
-        self.ui.listWidget_available.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
-        self.ui.listWidget_selected.setSelectionMode(QAbstractItemView.SelectionMode.MultiSelection)
-        self.ui.listWidget_selected.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.shot_lists = ShotLists(self.ui.listView_available, self.ui.listView_selected,
+                                    self.ui.lineEdit_availableSearch, self.ui.lineEdit_selectedSearch, parent=self)
         self.ui.pushButton_listControl_add.clicked.connect(self.on_move_available_item)
         self.ui.pushButton_listControl_remove.clicked.connect(self.on_move_selected_item)
         self.ui.toolButton_blender.clicked.connect(lambda: self.on_select_file("blender", "Select Blender Program"))
@@ -39,37 +46,60 @@ class ApplyLightPresetHandler(QWidget):
         self.ui.pushButton_buttonClear.clicked.connect(self.on_clear)
         self.ui.pushButton_buttonExecute.clicked.connect(self.on_generate)
 
-        self._wire_search_available()
-        self._wire_search_selected()
         self._enable_drag_drop_lineedits()
 
         self.on_load()
+        self._wire_autosave()
 
     def on_load(self):
-        data = JSONManager.read_json(Config.CONFIG_PATH)
+        # Until this tab has saved its own section, start from the Shot Generator's settings
+        data = self.config.values or JSONManager.read_section(Config.CONFIG_PATH, "shot_generator")
         if not data:
             return
-        sg_data = data['shot_generator']
-        self.ui.lineEdit_blender.setText(sg_data.get("blender_path", ""))
-        self.ui.lineEdit_csv.setText(sg_data.get("csv_path", ""))
-        self.ui.lineEdit_presetBlend.setText(sg_data.get("lighting_preset_blend", ""))
-        self.ui.lineEdit_presetJson.setText(sg_data.get("lighting_preset_json", ""))
+        self.ui.lineEdit_blender.setText(data.get("blender_path", ""))
+        self.ui.lineEdit_csv.setText(data.get("csv_path", ""))
+        self.ui.lineEdit_presetBlend.setText(data.get("lighting_preset_blend", ""))
+        self.ui.lineEdit_presetJson.setText(data.get("lighting_preset_json", ""))
+        self.ui.spinBox_workers.setValue(data.get("max_workers", 0))
+        self.ui.checkBox_persistent.setChecked(data.get("persistent_workers", False))
+        self.ui.spinBox_retries.setValue(data.get("job_retries", Config.BLENDER_JOB_RETRIES))
+        self.ui.doubleSpinBox_retryBackoff.setValue(data.get("job_retry_backoff", Config.BLENDER_JOB_RETRY_BACKOFF))
+        self.ui.spinBox_timeout.setValue(int(data.get("job_timeout", Config.BLENDER_JOB_TIMEOUT)))
+        self.ui.comboBox_progressCopy.setCurrentText(data.get("progress_copy_mode", "save"))
         print(self.ui.lineEdit_presetBlend.text())
-        project_name = data.get("project_name", "")
+        project_name = data.get("project", "")
         if project_name:
             index = self.ui.comboBox_project.findText(project_name)
             if index != -1:
                 self.ui.comboBox_project.setCurrentIndex(index)
 
     def on_save(self):
-        data = {
+        # Same key names as the Shot Generator section; debounced, autosave calls this on every edit
+        self.config.update({
             "blender_path": self.ui.lineEdit_blender.text(),
             "csv_path": self.ui.lineEdit_csv.text(),
-            "preset_blend_path": self.ui.lineEdit_presetBlend.text(),
-            "preset_json_path": self.ui.lineEdit_presetJson.text(),
-            "project_name": self.ui.comboBox_project.currentText()
-        }
-        JSONManager.write_json(Config.CONFIG_PATH, data)
+            "lighting_preset_blend": self.ui.lineEdit_presetBlend.text(),
+            "lighting_preset_json": self.ui.lineEdit_presetJson.text(),
+            "project": self.ui.comboBox_project.currentText(),
+            "max_workers": self.ui.spinBox_workers.value(),
+            "persistent_workers": self.ui.checkBox_persistent.isChecked(),
+            "job_retries": self.ui.spinBox_retries.value(),
+            "job_retry_backoff": self.ui.doubleSpinBox_retryBackoff.value(),
+            "job_timeout": self.ui.spinBox_timeout.value(),
+            "progress_copy_mode": self.ui.comboBox_progressCopy.currentText(),
+        })
+
+    def _wire_autosave(self):
+        # Wired after on_load so filling in the loaded values does not write them straight back
+        for line_edit in (self.ui.lineEdit_blender, self.ui.lineEdit_csv, self.ui.lineEdit_presetBlend,
+                          self.ui.lineEdit_presetJson):
+            line_edit.textChanged.connect(lambda _: self.on_save())
+        self.ui.comboBox_project.currentTextChanged.connect(lambda _: self.on_save())
+        self.ui.comboBox_progressCopy.currentTextChanged.connect(lambda _: self.on_save())
+        self.ui.checkBox_persistent.toggled.connect(lambda _: self.on_save())
+        for spin_box in (self.ui.spinBox_workers, self.ui.spinBox_retries, self.ui.doubleSpinBox_retryBackoff,
+                         self.ui.spinBox_timeout):
+            spin_box.valueChanged.connect(lambda _: self.on_save())
 
     def on_select_file(self, file_type: str, message: str):
         file_path, _ = QFileDialog.getOpenFileName(self, message, "", "All Files (*)")
@@ -89,7 +119,7 @@ class ApplyLightPresetHandler(QWidget):
             QMessageBox.warning(self, "Error", "No project selected")
             return
 
-        self.ui.listWidget_available.clear()
+        self.shot_lists.clear()
 
         csv_path = self.ui.lineEdit_csv.text()
         if not csv_path:
@@ -98,44 +128,31 @@ class ApplyLightPresetHandler(QWidget):
             return
 
         # Read CSV file
-        csv_data = CSVManager().read(file_path=csv_path, skip_header=True)
-        self.csv_data = csv_data
-        for row in csv_data:
-            # Expecting CSV format: EP, SEQ, SHOT, START_FRAME, END_FRAME
-            ep, seq, shot, start_frame, end_frame = row[0].lower(), row[1].lower(), row[2].lower(), int(row[3]), int(
-                row[4])
-            # print(
-            #     f"Scanning for EP: {ep}, SEQ: {seq}, SHOT: {shot}, Frames: {start_frame}-{end_frame} in project path: {project_path}")
-
-            file_name = FileManager().generate_file_name(project_code=project_data[2], ep=ep, seq=seq, shot=shot,
-                                                         division=division_list[1][0],
-                                                         extension="blend")  # Assuming 'lgt' division (target)
-            # print(f"File name: {file_name}")
-            self.ui.listWidget_available.addItem(file_name)
-            self._available_widget_order.append(file_name)
+        try:
+            self.shot_index = ShotIndex.from_csv(project_data[2], csv_path)
+        except (OSError, ShotListError) as e:
+            QMessageBox.warning(self, "Error", f"Could not read CSV file:\n{e}")
+            return
+        # 'lgt' division (target) file names, set in one model reset
+        self.shot_lists.set_shots([record.file_name for record in self.shot_index])
 
     def on_move_available_item(self):
-        sel = self.ui.listWidget_available.selectedItems()
-        for item in sel:
-            row = self.ui.listWidget_available.row(item)
-            item = self.ui.listWidget_available.takeItem(row)
-            self.ui.listWidget_selected.addItem(item)
+        self.shot_lists.select()
 
     def on_move_selected_item(self):
-        sel = self.ui.listWidget_selected.selectedItems()
-        for item in sel:
-            insert_row = self._find_insert_row_for_label(item.text())
-            row = self.ui.listWidget_selected.row(item)
-            item = self.ui.listWidget_selected.takeItem(row)
-            self.ui.listWidget_available.insertItem(insert_row, item)
+        self.shot_lists.deselect()
 
     def on_generate(self):
+        # The batch stack is only needed once a batch runs, so it is not imported at startup
+        from app.modules.main.handle_batch_progress import BatchProgressHandler
+        from app.services.job_journal import JobJournal
+
         project_data = next((p for p in project_list if p[1] == self.ui.comboBox_project.currentText()), None)
         if not project_data:
             QMessageBox.warning(self, "Error", "No project selected")
             return
 
-        project_production_path = FileManager().get_project_path(project_data[0])
+        builder = ShotBuilder(project_data)
 
         # Get Blender executable path
         blender_executable = self.ui.lineEdit_blender.text()
@@ -143,95 +160,112 @@ class ApplyLightPresetHandler(QWidget):
             QMessageBox.warning(self, "Error", "Blender executable path is empty.")
             return
 
-        for index in range(self.ui.listWidget_selected.count()):
-            shot_file = self.ui.listWidget_selected.item(index).text()
+        if not self.shot_index:
+            QMessageBox.warning(self, "Error", "No shots scanned. Scan the CSV first.")
+            return
+
+        blend_preset_filepath = str(self.ui.lineEdit_presetBlend.text())
+        json_preset_filepath = str(self.ui.lineEdit_presetJson.text())
+        if not blend_preset_filepath or not json_preset_filepath:
+            QMessageBox.warning(self, "Error", "Preset blend and JSON paths are required.")
+            return
+
+        records = []
+        for shot_file in self.shot_lists.selected_labels():
             print(f"Generating for shot file: {shot_file}")
 
-            for row in self.csv_data:
-                ep, seq, shot, start_frame, end_frame = row[0].lower(), row[1].lower(), row[2].lower(), int(
-                    row[3]), int(row[4])
-                expected_shot_file = FileManager().generate_file_name(project_code=project_data[2], ep=ep, seq=seq,
-                                                                      shot=shot,
-                                                                      division=division_list[1][0], extension="blend")
-                if shot_file == expected_shot_file:
-                    lighting_path = FileManager().generate_shot_path(project_path=project_production_path,
-                                                                     production=division_list[1][2],
-                                                                     division=division_list[1][3], ep=ep, seq=seq,
-                                                                     shot=shot)
-                    lighting_file = FileManager().combine_paths(lighting_path, shot_file)
-                    lighting_progress_dir = FileManager().combine_paths(lighting_path, "progress", mkdir=True)
-                    print(f"Lighting file path: {lighting_file}")
-                    next_path, nextversion, next_filename = FileManager().get_latest_version(
-                        progress_dir=str(lighting_progress_dir), shot_prefix=shot_file, ext=".blend")
-                    print(
-                        f"Next version path: {next_path}, next version: {nextversion}, next filename: {next_filename}")
-
-                    apply_preset_script = BlenderSettings.generate_apply_preset_script(
-                        master_file=str(lighting_file),
-                        character_collection=character_collection_name,
-                        output_path=str(lighting_file),
-                        output_path_progress=str(next_path),
-                        blend_preset_filepath=str(self.ui.lineEdit_presetBlend.text()),
-                        json_preset_filepath=str(self.ui.lineEdit_presetJson.text()),
-                        lighting_plugin_key=lighting_plugin_key
-                    )
-
-                    execute_blender = ExecuteProgram().blender_execute(blender_path=str(blender_executable),
-                                                                       script=apply_preset_script)
-
-                    if execute_blender:
-                        print(f"Successfully applied lighting preset to {shot_file}")
-                    else:
-                        print(f"Failed to apply lighting preset to {shot_file}")
-                        QMessageBox.warning(self, "Error", "Failed to apply lighting preset to {shot_file}")
-                    break
+            record = self.shot_index.get(shot_file)
+            if record is not None:
+                records.append(record)
+        # One parallel listing of every progress folder instead of one per shot
+        shots = builder.apply_preset_shots(records)
+        for shot_data in shots:
+            print(f"Lighting file path: {shot_data['lighting_file']}")
+
+        # Check every shot up front so the batch can run unattended
+        preflight = Preflight().run(
+            builder.batch_preflight(blender_executable, blend_preset_filepath=blend_preset_filepath,
+                                    json_preset_filepath=json_preset_filepath),
+            {shot["name"]: builder.apply_preset_preflight(shot) for shot in shots})
+        if preflight.batch_problems:
+            QMessageBox.critical(self, "Pre-flight Check Failed", preflight.format(max_shots=20))
+            return
+        if preflight.shot_problems:
+            reply = QMessageBox.question(
+                self,
+                "Pre-flight Check",
+                f"{len(preflight.shot_problems)} shot(s) cannot be processed:\n\n"
+                f"{preflight.format(max_shots=20)}\n\nSkip these shots and continue?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                QMessageBox.StandardButton.No
+            )
+            if reply == QMessageBox.StandardButton.No:
+                return
+            shots = [shot for shot in shots if shot["name"] not in preflight.shot_problems]
 
-    def _available_order_index(self, label: str) -> int:
-        try:
-            return self._available_widget_order.index(label)
-        except ValueError:
-            return len(self._available_widget_order)
-
-    def _find_insert_row_for_label(self, label: str) -> int:
-        """Cari posisi penyisipan berdasarkan urutan awal"""
-        target_idx = self._available_order_index(label)
-        lw = self.ui.listWidget_available
-        for row in range(lw.count()):
-            other_label = lw.item(row).text()
-            if self._available_order_index(other_label) > target_idx:
-                return row
-        return lw.count()
-
-    def _wire_search_available(self):
-        le = getattr(self.ui, "lineEdit_availableSearch", None)
-        if le:
-            le.textChanged.connect(self._filter_available_list)
-
-    def _filter_available_list(self, text: str):
-        lw = self.ui.listWidget_available
-        text_low = (text or "").lower().strip()
-        for i in range(lw.count()):
-            item = lw.item(i)
-            item.setHidden(text_low not in item.text().lower())
-
-    def _wire_search_selected(self):
-        le = getattr(self.ui, "lineEdit_selectedSearch", None)
-        if le:
-            le.textChanged.connect(self._filter_selected_list)
-
-    def _filter_selected_list(self, text: str):
-        lw = self.ui.listWidget_selected
-        text_low = (text or "").lower().strip()
-        for i in range(lw.count()):
-            item = lw.item(i)
-            item.setHidden(text_low not in item.text().lower())
+        journal = JobJournal()
+        shots = BatchProgressHandler.skip_completed(self, journal, shots, (
+            builder.apply_preset_job(shot, blend_preset_filepath=blend_preset_filepath,
+                                     json_preset_filepath=json_preset_filepath) for shot in shots))
+        if shots is None:
+            return
+
+        # Output folders are created only now, for the shots that will actually run
+        failed_dirs = builder.materialise_dirs(shots, builder.apply_preset_output_dirs)
+        if failed_dirs:
+            QMessageBox.warning(self, "Error", "Skipping shots whose folders could not be created:\n"
+                                + "\n".join(f"{name}: {error}" for name, error in failed_dirs.items()))
+            shots = [shot for shot in shots if shot["name"] not in failed_dirs]
+
+        failed_versions = builder.reserve_progress_versions(shots)
+        if failed_versions:
+            QMessageBox.warning(self, "Error", "Skipping shots whose progress version could not be reserved:\n"
+                                + "\n".join(f"{name}: {error}" for name, error in failed_versions.items()))
+            shots = [shot for shot in shots if shot["name"] not in failed_versions]
+        self._reserved_shots = shots
+
+        copier = ProgressCopier(self.ui.comboBox_progressCopy.currentText())
+        jobs = []
+        for shot_data in shots:
+            jobs.append(builder.apply_preset_job(
+                shot_data,
+                blend_preset_filepath=blend_preset_filepath,
+                json_preset_filepath=json_preset_filepath,
+                copier=copier
+            ))
+
+        if not jobs:
+            QMessageBox.information(self, "Info", "No shots to process")
+            return
+
+        self.ui.pushButton_buttonExecute.setEnabled(False)
+        self.batch_progress = BatchProgressHandler("Apply Light Preset - Progress")
+        self.batch_progress.batch_finished.connect(self.on_generate_finished)
+        self.batch_progress.start(blender_path=str(blender_executable), jobs=jobs,
+                                  max_workers=self.ui.spinBox_workers.value(),
+                                  persistent=self.ui.checkBox_persistent.isChecked(), on_success=copier,
+                                  journal=journal, retries=self.ui.spinBox_retries.value(),
+                                  retry_backoff=self.ui.doubleSpinBox_retryBackoff.value(),
+                                  timeout=self.ui.spinBox_timeout.value())
+
+    def on_generate_finished(self, results: dict):
+        self.ui.pushButton_buttonExecute.setEnabled(True)
+        ShotBuilder.release_progress_versions(self._reserved_shots)
+        self._reserved_shots = []
+        for shot_file, ok in results.items():
+            if ok:
+                print(f"Successfully applied lighting preset to {shot_file}")
+            else:
+                print(f"Failed to apply lighting preset to {shot_file}")
+        failed = [shot_file for shot_file, ok in results.items() if not ok]
+        if failed:
+            QMessageBox.warning(self, "Error", "Failed to apply lighting preset to:\n" + "\n".join(failed))
 
     def on_clear(self):
-        self.ui.listWidget_selected.clear()
-        self.ui.listWidget_available.clear()
+        self.shot_lists.clear()
         self.ui.lineEdit_availableSearch.clear()
         self.ui.lineEdit_selectedSearch.clear()
-        self.csv_data = None
+        self.shot_index = None
 
     def _enable_drag_drop_lineedits(self):
         def enable_dragdrop(le, exts=None):
@@ -0,0 +1,191 @@
+import os
+import time
+
+from PyQt6.QtCore import QObject, QThread, QTimer, Qt, pyqtSignal
+from PyQt6.QtWidgets import QWidget, QTableWidgetItem, QMessageBox
+
+from app.config import Config
+from app.services.blender_pool import BlenderPool
+from app.services.job_journal import JobJournal
+from app.services.job_logs import JobLogs
+from app.services.timing_report import TimingReport
+from app.ui.batch_progress_ui import Ui_Form
+
+
+class BlenderBatchWorker(QObject):
+    job_state_changed = pyqtSignal(str, str, float)
+    finished = pyqtSignal(dict)
+
+    def __init__(self, pool: BlenderPool, jobs: list, on_success=None, timing: TimingReport | None = None,
+                 logs: JobLogs | None = None, journal: JobJournal | None = None):
+        super().__init__()
+        self.pool = pool
+        self.jobs = jobs
+        self.on_success = on_success
+        self.timing = timing
+        self.logs = logs
+        self.journal = journal
+
+    def run(self):
+        # Runs inside the worker QThread; pool callbacks arrive from its own threads and
+        # are delivered to the GUI thread as queued signals
+        JobLogs.prune()
+        results = self.pool.run(self.jobs, on_state=self.job_state_changed.emit, on_success=self.on_success,
+                                timing=self.timing, logs=self.logs, journal=self.journal)
+        self.finished.emit(results)
+
+    def cancel(self):
+        self.pool.cancel()
+
+
+class BatchProgressHandler(QWidget):
+    batch_finished = pyqtSignal(dict)
+
+    def __init__(self, title: str):
+        super().__init__()
+        self.ui = Ui_Form()
+        self.ui.setupUi(self)
+        self.setWindowTitle(title)
+
+        self.ui.pushButton_cancel.clicked.connect(self.on_cancel)
+        self.ui.pushButton_close.clicked.connect(self.close)
+        self.ui.pushButton_close.setEnabled(False)
+
+        self._rows = {}
+        self._started = {}
+        self._finished_count = 0
+        self._thread = None
+        self._worker = None
+        self.timing = TimingReport()
+        # Blender output goes to per-job log files, which survive windowed builds without a console
+        self.logs = JobLogs()
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(1000)
+        self._timer.timeout.connect(self._refresh_elapsed)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.isRunning()
+
+    @staticmethod
+    def skip_completed(parent: QWidget, journal: JobJournal, shots: list[dict], probe_jobs) -> list[dict] | None:
+        # probe_jobs: the shots' single-shot jobs, built without a copier only to compare with the journal.
+        # Returns the shots to run, or None when the user cancels.
+        done = journal.completed(probe_jobs)
+        if not done:
+            return shots
+        reply = QMessageBox.question(
+            parent,
+            "Resume Batch",
+            f"{len(done)} of {len(shots)} shot(s) already finished in an earlier run and are up to date.\n\n"
+            f"Skip them and run only the remaining shots?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No | QMessageBox.StandardButton.Cancel,
+            QMessageBox.StandardButton.Yes
+        )
+        if reply == QMessageBox.StandardButton.Cancel:
+            return None
+        if reply == QMessageBox.StandardButton.No:
+            return shots
+        return [shot for shot in shots if shot["name"] not in done]
+
+    def start(self, blender_path: str, jobs: list[tuple[str, str, dict]], max_workers: int = 0,
+              persistent: bool = False, on_success=None, journal: JobJournal | None = None,
+              retries: int = Config.BLENDER_JOB_RETRIES, retry_backoff: float = Config.BLENDER_JOB_RETRY_BACKOFF,
+              timeout: float = Config.BLENDER_JOB_TIMEOUT):
+        table = self.ui.tableWidget_jobs
+        table.setRowCount(len(jobs))
+        for row, (name, *_) in enumerate(jobs):
+            self._rows[name] = row
+            table.setItem(row, 0, QTableWidgetItem(name))
+            table.setItem(row, 1, QTableWidgetItem(BlenderPool.STATE_QUEUED))
+            table.setItem(row, 2, QTableWidgetItem(""))
+        table.resizeColumnToContents(0)
+        self.ui.progressBar.setMaximum(len(jobs))
+        self.ui.progressBar.setValue(0)
+
+        pool = BlenderPool(blender_path=blender_path, max_workers=max_workers, persistent=persistent,
+                           retries=retries, retry_backoff=retry_backoff, timeout=timeout)
+        self.ui.label_summary.setText(f"Running {len(jobs)} job(s) with up to {pool.max_workers} worker(s)")
+
+        self._thread = QThread(self)
+        self._worker = BlenderBatchWorker(pool, jobs, on_success=on_success, timing=self.timing, logs=self.logs,
+                                          journal=journal)
+        self._worker.moveToThread(self._thread)
+        self._thread.started.connect(self._worker.run)
+        self._worker.job_state_changed.connect(self.on_job_state_changed)
+        self._worker.finished.connect(self.on_finished)
+        # Direct, so the thread also stops while the GUI thread is blocked in closeEvent's wait()
+        self._worker.finished.connect(self._thread.quit, Qt.ConnectionType.DirectConnection)
+
+        self._thread.start()
+        self._timer.start()
+        self.show()
+
+    def on_job_state_changed(self, name: str, state: str, elapsed: float):
+        row = self._rows.get(name)
+        if row is None:
+            return
+        self.ui.tableWidget_jobs.item(row, 1).setText(state)
+        if state == BlenderPool.STATE_RUNNING:
+            self._started[name] = time.monotonic()
+        elif state in (BlenderPool.STATE_DONE, BlenderPool.STATE_FAILED, BlenderPool.STATE_CANCELLED):
+            self._started.pop(name, None)
+            self.ui.tableWidget_jobs.item(row, 2).setText(self._format_elapsed(elapsed))
+            self._finished_count += 1
+            self.ui.progressBar.setValue(self._finished_count)
+
+    def on_cancel(self):
+        if self._worker is None:
+            return
+        self.ui.pushButton_cancel.setEnabled(False)
+        self.ui.label_summary.setText("Cancelling…")
+        self._worker.cancel()
+
+    def on_finished(self, results: dict):
+        self._timer.stop()
+        failed = sum(1 for ok in results.values() if not ok)
+        self.ui.label_summary.setText(f"Finished: {len(results) - failed} succeeded, {failed} failed or cancelled. "
+                                      f"Logs: {self.logs.batch_dir}")
+        self.ui.pushButton_cancel.setEnabled(False)
+        self.ui.pushButton_close.setEnabled(True)
+        self._save_timing()
+        self.batch_finished.emit(results)
+
+    def _save_timing(self):
+        if not self.timing.records:
+            return
+        print(self.timing.format())
+        file_path = os.path.join(self.logs.batch_dir, "timing.jsonl")
+        try:
+            os.makedirs(self.logs.batch_dir, exist_ok=True)
+            self.timing.save(file_path)
+            print(f"Timing records written to {file_path}")
+        except OSError as e:
+            print(f"[WARNING] Could not write timing records: {e}")
+
+    def closeEvent(self, event):
+        if self.running:
+            reply = QMessageBox.question(
+                self,
+                "Batch Running",
+                "Jobs are still running. Cancel the batch?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                QMessageBox.StandardButton.No
+            )
+            if reply == QMessageBox.StandardButton.No:
+                event.ignore()
+                return
+            self.on_cancel()
+            self._thread.wait()
+        event.accept()
+
+    def _refresh_elapsed(self):
+        now = time.monotonic()
+        for name, started in self._started.items():
+            self.ui.tableWidget_jobs.item(self._rows[name], 2).setText(self._format_elapsed(now - started))
+
+    @staticmethod
+    def _format_elapsed(seconds: float) -> str:
+        minutes, seconds = divmod(int(seconds), 60)
+        return f"{minutes:02d}:{seconds:02d}"
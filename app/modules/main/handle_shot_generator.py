@@ -1,15 +1,15 @@
-from PyQt6.QtWidgets import QWidget, QFileDialog, QMessageBox, QAbstractItemView
+from PyQt6.QtWidgets import QWidget, QFileDialog, QMessageBox
 
 from app.config import Config
-from app.services.execute_program import ExecuteProgram
-from app.services.json_manager import JSONManager
+from app.modules.main.shot_list_model import ShotLists
+from app.services.json_manager import ConfigSection, JSONManager
+from app.services.preflight import Preflight
+from app.services.progress_copy import PROGRESS_COPY_MODES, ProgressCopier
 from app.ui.shot_generator_widget_ui import Ui_Form
-from app.data.project import project_list, division_list
-from app.data.blender_config import collection_list, camera_collection_name, scene_name, cryptomatte_node, \
-    character_collection_name, output_node, lighting_plugin_key
-from app.services.csv_manager import CSVManager
+from app.data.project import project_list
 from app.services.file_manager import FileManager
-from app.services.blender_settings import BlenderSettings
+from app.services.shot_builder import ShotBuilder
+from app.services.shot_index import ShotIndex, ShotListError
 
 
 class ShotGeneratorHandler(QWidget):
@@ -25,10 +25,7 @@ class ShotGeneratorHandler(QWidget):
             lambda: self.on_select_file("mastershot", "Select Mastershot File"))
         for project in project_list:
             self.ui.comboBox_project.addItem(project[1])
-        self.ui.listWidget_available.setSelectionMode(QAbstractItemView.SelectionMode.MultiSelection)
-        self.ui.listWidget_available.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
-        self.ui.listWidget_selected.setSelectionMode(QAbstractItemView.SelectionMode.MultiSelection)
-        self.ui.listWidget_selected.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.shot_lists = ShotLists(self.ui.listView_available, self.ui.listView_selected, parent=self)
         self.ui.pushButton_listControl_add.clicked.connect(self.on_move_available_item)
         self.ui.pushButton_listControl_remove.clicked.connect(self.on_move_selected_item)
         self.ui.pushButton_generate.clicked.connect(self.on_generate)
@@ -47,19 +44,28 @@ class ShotGeneratorHandler(QWidget):
         self.ui.pushButton_loadConfig.clicked.connect(lambda: self.on_select_file("load_config", "Load Config File"))
         self.ui.pushButton_saveConfig.clicked.connect(lambda: self.on_save_json_file("Save Config File"))
 
-        self.csv_data = None
+        # Run options: 0 workers picks from CPU count and free memory, a 0 s timeout means no limit
+        self.ui.comboBox_progressCopy.addItems(PROGRESS_COPY_MODES)
+        self.ui.spinBox_retries.setValue(Config.BLENDER_JOB_RETRIES)
+        self.ui.doubleSpinBox_retryBackoff.setValue(Config.BLENDER_JOB_RETRY_BACKOFF)
+        self.ui.spinBox_timeout.setValue(int(Config.BLENDER_JOB_TIMEOUT))
+
+        self.shot_index = None
+        self.batch_progress = None
+        self.config = ConfigSection(Config.CONFIG_PATH, "shot_generator")
 
         self._enable_drag_drop_lineedits()
 
         self.on_load()
+        self._wire_autosave()
 
     def on_load(self, file_path: str = None):
         print("Loading…")
         if file_path is None:
-            file_path = Config.CONFIG_PATH
-        data = JSONManager.read_json(file_path)
-        if 'shot_generator' in data:
-            sg_data = data['shot_generator']
+            sg_data = self.config.values
+        else:
+            sg_data = JSONManager.read_section(file_path, 'shot_generator')
+        if sg_data:
             self.ui.lineEdit_csv.setText(sg_data.get('csv_path', ''))
             self.ui.lineEdit_blender.setText(sg_data.get('blender_path', ''))
             self.ui.lineEdit_mastershot.setText(sg_data.get('mastershot_path', ''))
@@ -77,14 +83,19 @@ class ShotGeneratorHandler(QWidget):
             self.ui.checkBox_lightingApply.setChecked(lighting_apply)
             self.ui.lineEdit_lightingPresetBlend.setText(sg_data.get('lighting_preset_blend', ''))
             self.ui.lineEdit_lightingPresetJson.setText(sg_data.get('lighting_preset_json', ''))
+            self.ui.spinBox_workers.setValue(sg_data.get('max_workers', 0))
+            self.ui.checkBox_persistent.setChecked(sg_data.get('persistent_workers', False))
+            self.ui.spinBox_retries.setValue(sg_data.get('job_retries', Config.BLENDER_JOB_RETRIES))
+            self.ui.doubleSpinBox_retryBackoff.setValue(
+                sg_data.get('job_retry_backoff', Config.BLENDER_JOB_RETRY_BACKOFF))
+            self.ui.spinBox_timeout.setValue(int(sg_data.get('job_timeout', Config.BLENDER_JOB_TIMEOUT)))
+            self.ui.checkBox_batch.setChecked(sg_data.get('batch_mode', False))
+            self.ui.comboBox_progressCopy.setCurrentText(sg_data.get('progress_copy_mode', "save"))
+            self.ui.checkBox_onlyChanged.setChecked(sg_data.get('only_changed', False))
             self.on_lighting_preset_toggle()  # Update UI based on checkbox state
 
     def on_save(self, file_path: str = None):
-        print("Saving…")
-        if file_path is None:
-            file_path = Config.CONFIG_PATH
-        data = {}
-        data['shot_generator'] = {
+        data = {
             'csv_path': self.ui.lineEdit_csv.text(),
             'blender_path': self.ui.lineEdit_blender.text(),
             'mastershot_path': self.ui.lineEdit_mastershot.text(),
@@ -94,8 +105,36 @@ class ShotGeneratorHandler(QWidget):
             'lighting_preset_apply': self.ui.checkBox_lightingApply.isChecked(),
             'lighting_preset_blend': self.ui.lineEdit_lightingPresetBlend.text(),
             'lighting_preset_json': self.ui.lineEdit_lightingPresetJson.text(),
+            'max_workers': self.ui.spinBox_workers.value(),
+            'persistent_workers': self.ui.checkBox_persistent.isChecked(),
+            'job_retries': self.ui.spinBox_retries.value(),
+            'job_retry_backoff': self.ui.doubleSpinBox_retryBackoff.value(),
+            'job_timeout': self.ui.spinBox_timeout.value(),
+            'batch_mode': self.ui.checkBox_batch.isChecked(),
+            'progress_copy_mode': self.ui.comboBox_progressCopy.currentText(),
+            'only_changed': self.ui.checkBox_onlyChanged.isChecked(),
         }
-        JSONManager.write_json(file_path, data)
+        if file_path is None:
+            # Debounced; autosave calls this on every edit
+            self.config.update(data)
+        else:
+            print("Saving…")
+            JSONManager.write_section(file_path, 'shot_generator', data)
+
+    def _wire_autosave(self):
+        # Wired after on_load so filling in the loaded values does not write them straight back
+        for line_edit in (self.ui.lineEdit_csv, self.ui.lineEdit_blender, self.ui.lineEdit_mastershot,
+                          self.ui.lineEdit_lightingPresetBlend, self.ui.lineEdit_lightingPresetJson):
+            line_edit.textChanged.connect(lambda _: self.on_save())
+        self.ui.comboBox_project.currentTextChanged.connect(lambda _: self.on_save())
+        self.ui.comboBox_progressCopy.currentTextChanged.connect(lambda _: self.on_save())
+        for button in (self.ui.radioButton_methodLink, self.ui.radioButton_methodAppend,
+                       self.ui.checkBox_lightingApply, self.ui.checkBox_persistent, self.ui.checkBox_batch,
+                       self.ui.checkBox_onlyChanged):
+            button.toggled.connect(lambda _: self.on_save())
+        for spin_box in (self.ui.spinBox_workers, self.ui.spinBox_retries, self.ui.doubleSpinBox_retryBackoff,
+                         self.ui.spinBox_timeout):
+            spin_box.valueChanged.connect(lambda _: self.on_save())
 
     def on_scan_files(self):
         project_data = next((p for p in project_list if p[1] == self.ui.comboBox_project.currentText()), None)
@@ -103,7 +142,7 @@ class ShotGeneratorHandler(QWidget):
             QMessageBox.warning(self, "Error", "No project selected")
             return
 
-        self.ui.listWidget_available.clear()
+        self.shot_lists.clear()
 
         csv_path = self.ui.lineEdit_csv.text()
         if not csv_path:
@@ -111,20 +150,13 @@ class ShotGeneratorHandler(QWidget):
             return
 
         # Read CSV file
-        csv_data = CSVManager().read(file_path=csv_path, skip_header=True)
-        self.csv_data = csv_data
-        for row in csv_data:
-            # Expecting CSV format: EP, SEQ, SHOT, START_FRAME, END_FRAME
-            ep, seq, shot, start_frame, end_frame = row[0].lower(), row[1].lower(), row[2].lower(), int(row[3]), int(
-                row[4])
-            # print(
-            #     f"Scanning for EP: {ep}, SEQ: {seq}, SHOT: {shot}, Frames: {start_frame}-{end_frame} in project path: {project_path}")
-
-            file_name = FileManager().generate_file_name(project_code=project_data[2], ep=ep, seq=seq, shot=shot,
-                                                         division=division_list[1][0],
-                                                         extension="blend")  # Assuming 'lgt' division (target)
-            # print(f"File name: {file_name}")
-            self.ui.listWidget_available.addItem(file_name)
+        try:
+            self.shot_index = ShotIndex.from_csv(project_data[2], csv_path)
+        except (OSError, ShotListError) as e:
+            QMessageBox.warning(self, "Error", f"Could not read CSV file:\n{e}")
+            return
+        # 'lgt' division (target) file names, set in one model reset
+        self.shot_lists.set_shots([record.file_name for record in self.shot_index])
 
     def on_select_file(self, file_type: str, message: str):
         file_path, _ = QFileDialog.getOpenFileName(self, message, "", "All Files (*)")
@@ -159,14 +191,10 @@ class ShotGeneratorHandler(QWidget):
             self.on_save(file_path)
 
     def on_move_available_item(self):
-        for item in self.ui.listWidget_available.selectedItems():
-            self.ui.listWidget_selected.addItem(item.text())
-            self.ui.listWidget_available.takeItem(self.ui.listWidget_available.row(item))
+        self.shot_lists.select()
 
     def on_move_selected_item(self):
-        for item in self.ui.listWidget_selected.selectedItems():
-            self.ui.listWidget_available.addItem(item.text())
-            self.ui.listWidget_selected.takeItem(self.ui.listWidget_selected.row(item))
+        self.shot_lists.deselect()
 
     def on_lighting_preset_toggle(self):
         if self.ui.checkBox_lightingApply.isChecked():
@@ -181,6 +209,13 @@ class ShotGeneratorHandler(QWidget):
             self.ui.toolButton_lightingPresetJson.setEnabled(False)
 
     def on_generate(self):
+        # The batch stack is only needed once a batch runs, so it is not imported at startup
+        from app.modules.main.handle_batch_progress import BatchProgressHandler
+        from app.services.blender_pool import BlenderPool
+        from app.services.blender_settings import BATCH_LIGHTING_SCRIPT
+        from app.services.job_journal import JobJournal
+        from app.services.shot_fingerprint import ShotFingerprints
+
         project_data = next((p for p in project_list if p[1] == self.ui.comboBox_project.currentText()), None)
         if not project_data:
             QMessageBox.warning(self, "Error", "No project selected")
@@ -195,9 +230,7 @@ class ShotGeneratorHandler(QWidget):
             QMessageBox.warning(self, "Error", "No method selected")
             return
 
-        # Get project path
-        project_production_path = FileManager().get_project_path(project_data[0])
-        project_output_path = FileManager().get_project_path(project_data[-1])
+        builder = ShotBuilder(project_data)
 
         # Get mastershot file path
         mastershot_path = self.ui.lineEdit_mastershot.text()
@@ -211,137 +244,126 @@ class ShotGeneratorHandler(QWidget):
             QMessageBox.warning(self, "Error", "Blender executable path is empty.")
             return
 
-        for index in range(self.ui.listWidget_selected.count()):
-            shot_file = self.ui.listWidget_selected.item(index).text()
+        apply_preset = self.ui.checkBox_lightingApply.isChecked()
+        blend_preset_filepath = str(self.ui.lineEdit_lightingPresetBlend.text())
+        json_preset_filepath = str(self.ui.lineEdit_lightingPresetJson.text())
+        max_workers = self.ui.spinBox_workers.value()
+        batch_mode = self.ui.checkBox_batch.isChecked()
+        only_changed = self.ui.checkBox_onlyChanged.isChecked()
+
+        if not self.shot_index:
+            QMessageBox.warning(self, "Error", "No shots scanned. Scan the CSV first.")
+            return
+
+        shots = []
+        for shot_file in self.shot_lists.selected_labels():
             print(f"Generating for shot file: {shot_file}")
 
-            for row in self.csv_data:
-                ep, seq, shot, start_frame, end_frame = row[0].lower(), row[1].lower(), row[2].lower(), int(
-                    row[3]), int(row[4])
-                expected_shot_file = FileManager().generate_file_name(project_code=project_data[2], ep=ep, seq=seq,
-                                                                      shot=shot,
-                                                                      division=division_list[1][0], extension="blend")
-                if shot_file == expected_shot_file:
-                    print(f"Match found in CSV for shot file: {shot_file} with frames {start_frame}-{end_frame}")
-
-                    # Get animation file
-                    animation_path = FileManager().generate_shot_path(project_path=project_production_path,
-                                                                      production=division_list[0][2],
-                                                                      division=division_list[0][3], ep=ep, seq=seq,
-                                                                      shot=shot)
-                    animation_name = FileManager().generate_file_name(project_code=project_data[2], ep=ep, seq=seq,
-                                                                      shot=shot,
-                                                                      division=division_list[0][0], extension="blend")
-                    animation_file = FileManager().combine_paths(animation_path, animation_name)
-
-                    # Check if animation file exists
-                    if not animation_file.exists():
-                        reply = QMessageBox.question(
-                            self,
-                            "Animation File Missing",
-                            "Animation file not found. Do you want to skip anyway?",
-                            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-                            QMessageBox.StandardButton.No
-                        )
-
-                        if reply == QMessageBox.StandardButton.No:
-                            return
-                        else:
-                            break
-
-                    # Generate lighting path
-                    lighting_path = FileManager().generate_shot_path(project_path=project_production_path,
-                                                                     production=division_list[1][2],
-                                                                     division=division_list[1][3], ep=ep, seq=seq,
-                                                                     shot=shot)
-                    lighting_file = FileManager().combine_paths(lighting_path, shot_file)
-                    lighting_progress_dir = FileManager().combine_paths(lighting_path, "progress", mkdir=True)
-                    versioned_name = FileManager().add_version_to_filename(shot_file, version=0)
-                    lighting_progress_file = FileManager().combine_paths(str(lighting_progress_dir), versioned_name)
-
-                    print(lighting_progress_dir)
-                    print(lighting_file)
-                    print(lighting_progress_file)
-                    output_node_data = []
-                    comp_path, comp_filename = FileManager().generate_png_comp(
-                        project_code=project_data[2],
-                        project_path=project_output_path,
-                        ep=ep,
-                        seq=seq,
-                        shot=shot,
-                        file_type="png",
-                        export_type="comp"
-                    )
-                    preview_path, preview_filename = FileManager().generate_png_comp(
-                        project_code=project_data[2],
-                        project_path=project_output_path,
-                        ep=ep,
-                        seq=seq,
-                        shot=shot,
-                        file_type="png",
-                        export_type="preview"
-                    )
-                    output_node_data.append((output_node[0], comp_path, comp_filename))
-                    output_node_data.append((output_node[1], preview_path, preview_filename))
-
-                    lighting_script = BlenderSettings.generate_lighting_script(
-                        master_file=str(mastershot_path),
-                        animation_file=str(animation_file),
-                        collection_list=collection_list,
-                        camera_collection=camera_collection_name,
-                        character_collection=character_collection_name,
-                        start_frame=start_frame,
-                        end_frame=end_frame,
-                        output_path=str(lighting_file),
-                        output_path_progress=str(lighting_progress_file),
-                        scene_name=scene_name,
-                        crypto_node=cryptomatte_node,
-                        output_node=output_node_data,
-                        method=link
-                    )
-
-                    lighting_script_with_preset = BlenderSettings.generate_lighting_with_light_script(
-                        master_file=str(mastershot_path),
-                        animation_file=str(animation_file),
-                        collection_list=collection_list,
-                        camera_collection=camera_collection_name,
-                        character_collection=character_collection_name,
-                        start_frame=start_frame,
-                        end_frame=end_frame,
-                        output_path=str(lighting_file),
-                        output_path_progress=str(lighting_progress_file),
-                        scene_name=scene_name,
-                        crypto_node=cryptomatte_node,
-                        output_node=output_node_data,
-                        method=link,
-                        blend_preset_filepath=str(self.ui.lineEdit_lightingPresetBlend.text()),
-                        json_preset_filepath=str(self.ui.lineEdit_lightingPresetJson.text()),
-                        lighting_plugin_key=lighting_plugin_key
-                    )
-
-                    if self.ui.checkBox_lightingApply.isChecked():
-                        execute_blender = ExecuteProgram().blender_execute(blender_path=blender_executable,
-                                                                           script=lighting_script_with_preset)
-                    else:
-                        execute_blender = ExecuteProgram().blender_execute(blender_path=blender_executable,
-                                                                           script=lighting_script)
+            record = self.shot_index.get(shot_file)
+            if record is None:
+                continue
+            print(f"Match found in CSV for shot file: {shot_file} with frames "
+                  f"{record.start_frame}-{record.end_frame}")
+            shots.append(builder.lighting_shot(record))
+
+        # Check every shot up front so the batch can run unattended
+        preflight = Preflight().run(
+            builder.batch_preflight(blender_executable, mastershot_path=mastershot_path,
+                                    blend_preset_filepath=blend_preset_filepath if apply_preset else "",
+                                    json_preset_filepath=json_preset_filepath if apply_preset else ""),
+            {shot["name"]: builder.lighting_preflight(shot) for shot in shots})
+        if preflight.batch_problems:
+            QMessageBox.critical(self, "Pre-flight Check Failed", preflight.format(max_shots=20))
+            return
+        if preflight.shot_problems:
+            reply = QMessageBox.question(
+                self,
+                "Pre-flight Check",
+                f"{len(preflight.shot_problems)} shot(s) cannot be generated:\n\n"
+                f"{preflight.format(max_shots=20)}\n\nSkip these shots and continue?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                QMessageBox.StandardButton.No
+            )
+            if reply == QMessageBox.StandardButton.No:
+                return
+            shots = [shot for shot in shots if shot["name"] not in preflight.shot_problems]
+
+        # Single-shot jobs built without a copier, only to fingerprint the shots and compare with the journal
+        probe_jobs = [builder.lighting_job(shot, mastershot_path=str(mastershot_path), link=link,
+                                           apply_preset=apply_preset, blend_preset_filepath=blend_preset_filepath,
+                                           json_preset_filepath=json_preset_filepath) for shot in shots]
+        fingerprints = ShotFingerprints()
+        for job in probe_jobs:
+            fingerprints.add(job, self.shot_index.get(job[0]),
+                             script=BATCH_LIGHTING_SCRIPT if batch_mode else None)
+        if only_changed:
+            unchanged = fingerprints.unchanged()
+            print(f"Only changed: skipping {len(unchanged)} shot(s) whose inputs have not changed")
+            shots = [shot for shot in shots if shot["name"] not in unchanged]
+            probe_jobs = [job for job in probe_jobs if job[0] not in unchanged]
+
+        journal = JobJournal(on_done=fingerprints.write)
+        shots = BatchProgressHandler.skip_completed(self, journal, shots, probe_jobs)
+        if shots is None:
+            return
 
-                    if execute_blender:
-                        print(f"Blender process for {shot_file} completed successfully.")
-                    else:
-                        print(f"Blender process for {shot_file} failed.")
-                        QMessageBox.critical(self, "Error", f"Failed to generate lighting file for: {shot_file}")
-                    break
+        # Output folders are created only now, for the shots that will actually run
+        failed_dirs = builder.materialise_dirs(shots, builder.lighting_output_dirs)
+        if failed_dirs:
+            QMessageBox.warning(self, "Error", "Skipping shots whose folders could not be created:\n"
+                                + "\n".join(f"{name}: {error}" for name, error in failed_dirs.items()))
+            shots = [shot for shot in shots if shot["name"] not in failed_dirs]
+
+        copier = ProgressCopier(self.ui.comboBox_progressCopy.currentText())
+        jobs = []
+        batch_shots = []
+        for shot_data in shots:
+            if batch_mode:
+                # Built later as part of one multi-shot script per worker
+                batch_shots.append(shot_data)
+                continue
+
+            jobs.append(builder.lighting_job(shot_data, mastershot_path=str(mastershot_path), link=link,
+                                             apply_preset=apply_preset,
+                                             blend_preset_filepath=blend_preset_filepath,
+                                             json_preset_filepath=json_preset_filepath, copier=copier))
+
+        if batch_shots:
+            workers = max_workers if max_workers > 0 else BlenderPool.default_workers()
+            jobs = builder.batch_jobs(batch_shots, workers=workers, mastershot_path=str(mastershot_path), link=link,
+                                      apply_preset=apply_preset, blend_preset_filepath=blend_preset_filepath,
+                                      json_preset_filepath=json_preset_filepath, copier=copier)
+
+        if not jobs:
+            QMessageBox.information(self, "Info", "No shots to generate" if not only_changed
+                                    else "No shots to generate: every selected shot is unchanged")
+            return
+
+        self.ui.pushButton_generate.setEnabled(False)
+        self.batch_progress = BatchProgressHandler("Shot Generator - Progress")
+        self.batch_progress.batch_finished.connect(self.on_generate_finished)
+        self.batch_progress.start(blender_path=blender_executable, jobs=jobs, max_workers=max_workers,
+                                  persistent=self.ui.checkBox_persistent.isChecked(), on_success=copier,
+                                  journal=journal, retries=self.ui.spinBox_retries.value(),
+                                  retry_backoff=self.ui.doubleSpinBox_retryBackoff.value(),
+                                  timeout=self.ui.spinBox_timeout.value())
+
+    def on_generate_finished(self, results: dict):
+        self.ui.pushButton_generate.setEnabled(True)
+        failed = [shot_file for shot_file, ok in results.items() if not ok]
+        if failed:
+            QMessageBox.critical(self, "Error", "Failed to generate lighting file for:\n" + "\n".join(failed))
+            return
         QMessageBox.information(self, "Success", "Successfully generated lighting file")
 
     def on_clear(self):
-        self.ui.listWidget_selected.clear()
-        self.ui.listWidget_available.clear()
-        self.csv_data = None
+        self.shot_lists.clear()
+        self.shot_index = None
 
     def closeEvent(self, event):
         # This method is called when the window is closed
         self.on_save()
+        self.config.flush()
         event.accept()
 
     def _enable_drag_drop_lineedits(self):
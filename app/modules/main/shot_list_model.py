@@ -0,0 +1,122 @@
+import bisect
+
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, QObject, QSortFilterProxyModel, Qt, QTimer
+from PyQt6.QtWidgets import QAbstractItemView, QLineEdit, QListView
+
+# Filtering waits for a pause in typing instead of running on every keystroke
+FILTER_DELAY_MS = 150
+
+
+def _runs(rows: list[int]) -> list[tuple[int, int]]:
+    # Sorted rows -> [(first, last), ...] of consecutive rows
+    runs = []
+    for row in rows:
+        if runs and runs[-1][1] == row - 1:
+            runs[-1] = (runs[-1][0], row)
+        else:
+            runs.append((row, row))
+    return runs
+
+
+class ShotListModel(QAbstractListModel):
+    # Flat list of shot file names; the view only asks for the rows it draws
+    def __init__(self, parent: QObject | None = None):
+        super().__init__(parent)
+        self._labels = []
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._labels)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and index.isValid():
+            return self._labels[index.row()]
+        return None
+
+    def labels(self) -> list[str]:
+        return list(self._labels)
+
+    def set_labels(self, labels):
+        self.beginResetModel()
+        self._labels = list(labels)
+        self.endResetModel()
+
+    def take_rows(self, rows) -> list[str]:
+        # Removes the rows one consecutive run at a time, bottom up, so earlier rows keep their numbers
+        rows = sorted(set(rows))
+        taken = [self._labels[row] for row in rows]
+        for first, last in reversed(_runs(rows)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._labels[first:last + 1]
+            self.endRemoveRows()
+        return taken
+
+    def insert_sorted(self, labels, order: dict[str, int]):
+        # The list is kept in `order`; each new label's row comes from a binary search and labels
+        # landing on the same row go in as one block. Unknown labels go to the end.
+        fallback = len(order)
+        keys = [order.get(label, fallback) for label in self._labels]
+        blocks = {}
+        for label in sorted(labels, key=lambda label: order.get(label, fallback)):
+            blocks.setdefault(bisect.bisect_right(keys, order.get(label, fallback)), []).append(label)
+        for row in sorted(blocks, reverse=True):
+            block = blocks[row]
+            self.beginInsertRows(QModelIndex(), row, row + len(block) - 1)
+            self._labels[row:row] = block
+            self.endInsertRows()
+
+
+class ShotLists(QObject):
+    # The available/selected shot lists of a tab. Both stay in CSV order, held as {file name: row},
+    # so a shot moved back lands in its old place without searching the list.
+    def __init__(self, available_view: QListView, selected_view: QListView,
+                 available_search: QLineEdit | None = None, selected_search: QLineEdit | None = None,
+                 parent: QObject | None = None):
+        super().__init__(parent)
+        self.available = ShotListModel(self)
+        self.selected = ShotListModel(self)
+        self.available_view = available_view
+        self.selected_view = selected_view
+        self._order = {}
+        for model, view, search in ((self.available, available_view, available_search),
+                                    (self.selected, selected_view, selected_search)):
+            proxy = QSortFilterProxyModel(self)
+            proxy.setSourceModel(model)
+            proxy.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+            view.setModel(proxy)
+            view.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+            view.setUniformItemSizes(True)
+            if search is not None:
+                self._wire_filter(proxy, search)
+
+    def _wire_filter(self, proxy: QSortFilterProxyModel, search: QLineEdit):
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.setInterval(FILTER_DELAY_MS)
+        timer.timeout.connect(lambda: proxy.setFilterFixedString(search.text().strip()))
+        search.textChanged.connect(lambda _: timer.start())
+
+    def set_shots(self, labels: list[str]):
+        self._order = {}
+        for row, label in enumerate(labels):
+            self._order.setdefault(label, row)
+        self.available.set_labels(labels)
+        self.selected.set_labels([])
+
+    def _move(self, view: QListView, source: ShotListModel, target: ShotListModel):
+        proxy = view.model()
+        rows = [proxy.mapToSource(index).row() for index in view.selectionModel().selectedRows()]
+        if rows:
+            view.clearSelection()
+            target.insert_sorted(source.take_rows(rows), self._order)
+
+    def select(self):
+        self._move(self.available_view, self.available, self.selected)
+
+    def deselect(self):
+        self._move(self.selected_view, self.selected, self.available)
+
+    def selected_labels(self) -> list[str]:
+        return self.selected.labels()
+
+    def clear(self):
+        self.set_shots([])
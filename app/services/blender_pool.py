@@ -0,0 +1,274 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from app.config import Config
+from app.services.blender_worker import BlenderWorker
+from app.services.execute_program import ExecuteProgram
+from app.services.job_journal import STATUS_CANCELLED, STATUS_DONE, STATUS_FAILED, JobJournal
+from app.services.job_logs import JobLogs
+from app.services.scratch_dir import ScratchDir
+from app.services.timing_report import TimingReport
+
+
+class BlenderPool:
+    STATE_QUEUED = "queued"
+    STATE_RUNNING = "running"
+    STATE_RETRYING = "retrying"
+    STATE_DONE = "done"
+    STATE_FAILED = "failed"
+    STATE_CANCELLED = "cancelled"
+
+    def __init__(self, blender_path: str, max_workers: int = 0, persistent: bool = False,
+                 retries: int = Config.BLENDER_JOB_RETRIES, retry_backoff: float = Config.BLENDER_JOB_RETRY_BACKOFF,
+                 timeout: float = Config.BLENDER_JOB_TIMEOUT):
+        self.blender_path = blender_path
+        self.max_workers = max_workers if max_workers and max_workers > 0 else self.default_workers()
+        # persistent: each pool thread keeps one Blender worker alive for all of its jobs
+        self.persistent = persistent
+        self.retries = max(0, retries)
+        self.retry_backoff = retry_backoff
+        self.timeout = timeout
+        self._cancel_event = threading.Event()
+        self._lock = threading.Lock()
+        self._processes = {}
+        self._local = threading.local()
+        self._workers = []
+        self._scratch = None
+
+    @staticmethod
+    def available_memory_mb() -> int | None:
+        # Prefer MemAvailable (includes reclaimable page cache) over plain free pages
+        try:
+            with open("/proc/meminfo", "r") as f:
+                for line in f:
+                    if line.startswith("MemAvailable:"):
+                        return int(line.split()[1]) // 1024
+        except (OSError, ValueError, IndexError):
+            pass
+        try:
+            return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") // (1024 * 1024)
+        except (AttributeError, ValueError, OSError):
+            return None
+
+    @staticmethod
+    def default_workers() -> int:
+        workers = os.cpu_count() or 1
+        memory_mb = BlenderPool.available_memory_mb()
+        if memory_mb is not None:
+            workers = min(workers, memory_mb // Config.BLENDER_JOB_MEMORY_MB)
+        return max(1, workers)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        # Queued jobs are skipped, running Blender processes are terminated
+        self._cancel_event.set()
+        with self._lock:
+            processes = list(self._processes.values())
+        for process in processes:
+            try:
+                process.terminate()
+            except OSError:
+                pass
+
+    def _run_job(self, name: str, script: str, params: dict, on_state=None, on_success=None,
+                 timing: TimingReport | None = None, logs: JobLogs | None = None,
+                 journal: JobJournal | None = None) -> bool:
+        if self.cancelled:
+            if on_state:
+                on_state(name, self.STATE_CANCELLED, 0.0)
+            return False
+
+        processes = []
+
+        def register(process):
+            processes.append(process)
+            with self._lock:
+                self._processes[name] = process
+            # cancel() may have fired between the check above and Popen
+            if self.cancelled:
+                process.terminate()
+
+        def on_timing(record):
+            timing.add(name, record)
+
+        log = None
+        if logs:
+            try:
+                log = logs.open(name)
+            except OSError as e:
+                print(f"[WARNING] Could not open the log for {name}: {e}")
+        started = time.monotonic()
+        if on_state:
+            on_state(name, self.STATE_RUNNING, 0.0)
+        stale = set()  # expected outputs of the whole job that are still missing or untouched
+        payload_path = None
+        try:
+            ok = False
+            todo = params
+            if not self.persistent:
+                # Reused by every attempt that runs the same params; the persistent worker gets params over stdin
+                payload_path = self._scratch.write_payload(name, script, todo)
+            attempts = self.retries + 1
+            for attempt in range(1, attempts + 1):
+                if attempt > 1:
+                    retry = self._retry_params(name, todo, stale, log.write if log else None)
+                    if retry is None:
+                        break
+                    if retry is not todo and payload_path:
+                        self._scratch.release(payload_path, True)
+                        payload_path = self._scratch.write_payload(name, script, retry)
+                    todo = retry
+                    delay = self.retry_backoff * 2 ** (attempt - 2)
+                    shots = f", {len(todo['shots'])} shot(s)" if "shots" in todo else ""
+                    print(f"[RETRY] {name}: attempt {attempt}/{attempts}{shots} in {delay:.0f}s")
+                    if log:
+                        log.write(f"\n===== Attempt {attempt}/{attempts}{shots} =====\n")
+                    if on_state:
+                        on_state(name, self.STATE_RETRYING, time.monotonic() - started)
+                    # Returns early when the batch is cancelled during the wait
+                    if self._cancel_event.wait(delay):
+                        break
+                ok, attempt_stale = self._attempt(name, script, todo, payload_path, register,
+                                                  on_timing if timing else None, log.write if log else None)
+                # Shots left out of this attempt keep what the earlier attempts left them
+                stale.difference_update(ExecuteProgram.expected_outputs(todo))
+                stale.update(attempt_stale)
+                if ok or self.cancelled:
+                    break
+            if ok and on_success and not self.cancelled:
+                # Post-processing after Blender exits, e.g. copying the progress version
+                ok = on_success(name)
+        except Exception as e:
+            print(f"[ERROR] Blender job for {name} raised: {e}")
+            ok = False
+        finally:
+            with self._lock:
+                self._processes.pop(name, None)
+            if payload_path:
+                # Cancelled jobs did not fail, so their inputs are not worth keeping
+                kept = self._scratch.release(payload_path, ok or self.cancelled)
+                if kept:
+                    print(f"[INFO] Inputs of failed job {name} kept at {kept}")
+                    if log:
+                        log.write(f"Job inputs kept at {kept}\n")
+
+        elapsed = time.monotonic() - started
+        if self.cancelled:
+            state = self.STATE_CANCELLED
+            ok = False
+        else:
+            state = self.STATE_DONE if ok else self.STATE_FAILED
+        if log:
+            # A persistent worker outlives the job, so there is no per-job exit code
+            exit_code = None if self.persistent or not processes else processes[-1].returncode
+            shots = [shot["name"] for shot in params.get("shots", ())] or None
+            logs.finish(name, log, exit_code, ok, shots=shots)
+        if journal:
+            status = {self.STATE_DONE: STATUS_DONE, self.STATE_CANCELLED: STATUS_CANCELLED}.get(state, STATUS_FAILED)
+            journal.record(name, script, params, status, stale_outputs=stale)
+        if on_state:
+            on_state(name, state, elapsed)
+        return ok
+
+    @staticmethod
+    def _retry_params(name: str, params: dict, stale: set[str], on_output=None) -> dict | None:
+        # What a failed attempt leaves to redo, or None when nothing can be retried. A batch keeps only
+        # its shots with an output still missing. A preset job whose lighting file was already saved is
+        # not run again: apply-preset reopens that very file, so the preset would go on twice.
+        def rerunnable(shot_params: dict) -> bool:
+            if not shot_params.get("json_preset_filepath") or shot_params["output_path"] in stale:
+                return True
+            message = f"[WARNING] {name}: not retried, {shot_params['output_path']} was already saved"
+            print(message)
+            if on_output:
+                on_output(message + "\n")
+            return False
+
+        if "shots" not in params:
+            return params if rerunnable(params) else None
+        shots = [shot for shot in params["shots"]
+                 if stale.intersection(ExecuteProgram.expected_outputs(shot)) and rerunnable(dict(params, **shot))]
+        if not shots:
+            return None
+        if len(shots) == len(params["shots"]):
+            return params
+        return dict(params, shots=shots)
+
+    def _attempt(self, name: str, script: str, params: dict, payload_path: str | None, register, on_timing=None,
+                 on_output=None) -> tuple[bool, list[str]]:
+        # One run of the job -> (ok, outputs it did not write); it only counts when Blender succeeded
+        # and wrote every expected output
+        before = ExecuteProgram.output_mtimes(ExecuteProgram.expected_outputs(params))
+        if self.persistent:
+            ok = self._run_in_worker(name, script, params, register, on_timing, on_output)
+        else:
+            ok = ExecuteProgram.blender_execute(blender_path=self.blender_path, payload_path=payload_path,
+                                                on_process=register, on_timing=on_timing, on_output=on_output,
+                                                timeout=self.timeout)
+        stale = ExecuteProgram.stale_outputs(before)
+        if not ok:
+            return False, stale
+        for path in stale:
+            message = f"[ERROR] {name}: expected output was not written: {path}"
+            print(message)
+            if on_output:
+                on_output(message + "\n")
+        return not stale, stale
+
+    def _run_in_worker(self, name: str, script: str, params: dict, register, on_timing=None,
+                       on_output=None) -> bool:
+        worker = getattr(self._local, "worker", None)
+        if worker is None:
+            worker = BlenderWorker(self.blender_path)
+            self._local.worker = worker
+            with self._lock:
+                self._workers.append(worker)
+        if not worker.alive and not worker.start():
+            return False
+        register(worker.process)
+        return worker.run(name, script, params, on_timing=on_timing, on_output=on_output, timeout=self.timeout)
+
+    def _stop_workers(self):
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.stop()
+
+    def run(self, jobs: list[tuple[str, str, dict]], on_state=None, on_success=None,
+            timing: TimingReport | None = None, logs: JobLogs | None = None,
+            journal: JobJournal | None = None) -> dict[str, bool]:
+        # jobs: [(name, script, params), ...] -> {name: success} in submission order
+        # on_state(name, state, elapsed_seconds) and on_success(name) -> bool are called from worker threads
+        # timing collects the stage timings every job reports; logs keeps each job's output;
+        # journal records which shots finished, for resuming the batch
+        results = {name: False for name, *_ in jobs}
+        if not jobs:
+            return results
+
+        if on_state:
+            for name, *_ in jobs:
+                on_state(name, self.STATE_QUEUED, 0.0)
+
+        workers = min(self.max_workers, len(jobs))
+        print(f"Running {len(jobs)} Blender job(s) with {workers} worker(s)")
+        ScratchDir.prune()
+        self._scratch = ScratchDir()
+        try:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="blender") as executor:
+                futures = {executor.submit(self._run_job, name, script, params, on_state, on_success, timing,
+                                           logs, journal): name
+                           for name, script, params in jobs}
+                for future in as_completed(futures):
+                    name = futures[future]
+                    results[name] = future.result()
+                    print(f"[{'DONE' if results[name] else 'FAILED'}] {name}")
+        finally:
+            self._stop_workers()
+            self._scratch.cleanup()
+
+        return results
@@ -0,0 +1,128 @@
+import json
+import subprocess
+import threading
+from pathlib import Path
+
+WORKER_SCRIPT = Path(__file__).resolve().parent.parent / "data" / "raw" / "blender_worker.py"
+PROTOCOL_PREFIX = "@@SBBC@@ "
+
+
+class BlenderWorker:
+    def __init__(self, blender_path: str):
+        self.blender_path = blender_path
+        self.process = None
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def start(self) -> bool:
+        try:
+            self.process = subprocess.Popen(
+                [self.blender_path, "--background", "--python-exit-code", "1", "--python", str(WORKER_SCRIPT)],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+                bufsize=1,
+            )
+        except OSError as e:
+            print(f"An error occurred while starting the Blender worker: {e}")
+            self.process = None
+            return False
+
+        message = self._read_message()
+        if not message or message.get("event") != "ready":
+            print("[ERROR] Blender worker did not become ready")
+            self.stop()
+            return False
+        return True
+
+    def run(self, job_id: str, script: str, params: dict, on_timing=None, on_output=None,
+            timeout: float = 0) -> bool:
+        # timeout: seconds before a hung job is killed together with its worker (0 = no limit)
+        if not self.alive and not self.start():
+            return False
+        try:
+            self.process.stdin.write(json.dumps({"id": job_id, "script": script, "params": params}) + "\n")
+            self.process.stdin.flush()
+        except (OSError, ValueError) as e:
+            print(f"[ERROR] Could not send job {job_id} to the Blender worker: {e}")
+            self.stop()
+            return False
+
+        timed_out = threading.Event()
+        timer = None
+        if timeout > 0:
+            timer = threading.Timer(timeout, self._kill, (self.process, timed_out))
+            timer.daemon = True
+            timer.start()
+        try:
+            return self._wait_for_job(job_id, on_timing, on_output, timed_out, timeout)
+        finally:
+            if timer:
+                timer.cancel()
+
+    @staticmethod
+    def _kill(process, timed_out: threading.Event):
+        timed_out.set()
+        try:
+            process.kill()
+        except OSError:
+            pass
+
+    def _wait_for_job(self, job_id: str, on_timing, on_output, timed_out: threading.Event, timeout: float) -> bool:
+        # Reads up to the job's "end" marker, so output Blender flushes after "done" stays with this job
+        ok = None
+        while True:
+            message = self._read_message(on_output)
+            if message is None:
+                # Worker died (crash, terminate or timeout); the next run() starts a fresh one
+                self.stop()
+                if ok is not None and not timed_out.is_set():
+                    # After the job had reported its result
+                    return ok
+                if timed_out.is_set():
+                    print(f"[ERROR] {job_id} timed out after {timeout:.0f}s; Blender worker killed")
+                else:
+                    print(f"[ERROR] Blender worker exited while running {job_id}")
+                return False
+            if message.get("event") == "stage":
+                if on_timing:
+                    on_timing(message)
+                continue
+            if message.get("event") == "done" and message.get("id") == job_id:
+                ok = bool(message.get("ok"))
+                continue
+            if message.get("event") == "end" and message.get("id") == job_id:
+                return bool(ok)
+            if message.get("event") == "error":
+                print(f"[ERROR] Blender worker: {message.get('error')}")
+
+    def stop(self):
+        if self.process is None:
+            return
+        if self.alive:
+            try:
+                self.process.stdin.write(json.dumps({"command": "quit"}) + "\n")
+                self.process.stdin.close()
+                self.process.wait(timeout=30)
+            except (OSError, ValueError, subprocess.TimeoutExpired):
+                self.process.kill()
+                self.process.wait()
+        self.process = None
+
+    def _read_message(self, on_output=None) -> dict | None:
+        # Pass Blender's own output through and return the next protocol message, None on EOF
+        for line in self.process.stdout:
+            if line.startswith(PROTOCOL_PREFIX):
+                try:
+                    return json.loads(line[len(PROTOCOL_PREFIX):])
+                except ValueError:
+                    continue
+            print(line, end="")
+            if on_output:
+                on_output(line)
+        return None
@@ -8,4 +8,14 @@ class CSVManager:
             reader = csv.reader(file)
             if skip_header:
                 next(reader)
-            return list(reader)
\ No newline at end of file
+            return list(reader)
+
+    @staticmethod
+    def iter_rows(file_path: str):
+        # Streams (line_number, row) without materialising the file; blank rows are skipped
+        with open(file_path, mode='r', newline='', encoding='utf-8-sig') as file:
+            reader = csv.reader(file)
+            for row in reader:
+                if not any(cell.strip() for cell in row):
+                    continue
+                yield reader.line_num, row
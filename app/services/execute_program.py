@@ -1,16 +1,109 @@
+import json
+import os
 import subprocess
-import tempfile
+import threading
+
+from app.services.blender_settings import RUNNER_SCRIPT
+from app.services.blender_worker import PROTOCOL_PREFIX
 
 class ExecuteProgram:
     @staticmethod
-    def blender_execute(blender_path: str, script: str):
+    def blender_execute(blender_path: str, payload_path: str, on_process=None, on_timing=None,
+                        on_output=None, timeout: float = 0) -> bool:
+        # payload_path: {"script": <file in app/data/raw>, "params": {...}} (see ScratchDir.write_payload),
+        # run through the stable runner script
+        # on_timing(record) receives each stage timing line the script reports
+        # on_output(line) receives the rest of stdout and stderr, line by line as Blender prints it
+        # Succeeds only on exit code 0 plus the runner's "completed" sentinel; timeout (seconds, 0 = none)
+        # kills a hung Blender
+        try:
+            process = subprocess.Popen([blender_path, "--background", "--python-exit-code", "1",
+                                        "--python", str(RUNNER_SCRIPT), "--", payload_path],
+                                       stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                       text=True, encoding="utf-8", errors="replace")
+        except (OSError, subprocess.SubprocessError) as e:
+            return ExecuteProgram._fail(f"An error occurred while executing Blender: {e}", on_output)
+
+        if on_process:
+            # Lets the caller keep a handle on the process, e.g. to terminate it on cancel
+            on_process(process)
+        timed_out = threading.Event()
+        timer = None
+        if timeout > 0:
+            timer = threading.Timer(timeout, ExecuteProgram._kill, (process, timed_out))
+            timer.daemon = True
+            timer.start()
+
+        completed = False
+        try:
+            for line in process.stdout:
+                if line.startswith(PROTOCOL_PREFIX):
+                    event = ExecuteProgram._handle_message(line[len(PROTOCOL_PREFIX):], on_timing)
+                    completed = completed or event == "completed"
+                else:
+                    print(line, end="")
+                    if on_output:
+                        on_output(line)
+            process.wait()
+        finally:
+            if timer:
+                timer.cancel()
+
+        if timed_out.is_set():
+            return ExecuteProgram._fail(f"[ERROR] Blender timed out after {timeout:.0f}s and was killed", on_output)
+        if process.returncode != 0:
+            return ExecuteProgram._fail(f"[ERROR] Blender exited with code {process.returncode}", on_output)
+        if not completed:
+            return ExecuteProgram._fail("[ERROR] Blender exited before the script completed", on_output)
+        return True
+
+    @staticmethod
+    def _kill(process, timed_out: threading.Event):
+        timed_out.set()
         try:
-            with tempfile.NamedTemporaryFile("w", suffix=".py", delete=False) as tmp:
-                tmp.write(script)
-                tmp_path = tmp.name
-
-            subprocess.run([blender_path, "--background", "--python", tmp_path])
-            return True
-        except subprocess.CalledProcessError as e:
-            print(f"An error occurred while executing Blender: {e}")
-            return False
\ No newline at end of file
+            process.kill()
+        except OSError:
+            pass
+
+    @staticmethod
+    def _fail(message: str, on_output=None) -> bool:
+        print(message)
+        if on_output:
+            on_output(message + "\n")
+        return False
+
+    @staticmethod
+    def _handle_message(text: str, on_timing=None) -> str | None:
+        # Returns the event name
+        try:
+            message = json.loads(text)
+        except ValueError:
+            return None
+        if message.get("event") == "stage" and on_timing:
+            on_timing(message)
+        return message.get("event")
+
+    @staticmethod
+    def expected_outputs(params: dict) -> list[str]:
+        # Files a successful job must have written, for single-shot and batch params alike
+        paths = []
+        for shot in params.get("shots") or [params]:
+            paths.extend(path for path in (shot.get("output_path"), shot.get("output_path_progress")) if path)
+        return paths
+
+    @staticmethod
+    def output_mtimes(paths: list[str]) -> dict[str, int | None]:
+        mtimes = {}
+        for path in paths:
+            try:
+                mtimes[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                mtimes[path] = None
+        return mtimes
+
+    @staticmethod
+    def stale_outputs(before: dict[str, int | None]) -> list[str]:
+        # Outputs still missing or untouched since before the job. Comparing with the file's own
+        # earlier mtime, not the local clock, keeps this right on NAS shares with clock skew.
+        after = ExecuteProgram.output_mtimes(list(before))
+        return [path for path, mtime in after.items() if mtime is None or mtime == before[path]]
@@ -1,7 +1,14 @@
+import errno
+import hashlib
 import os
-import re
+import shutil
 from pathlib import Path
 
+from app.services.version_index import VersionIndex
+
+# Linux FICLONE ioctl: share the source blocks copy-on-write (btrfs, XFS, some NAS filesystems)
+FICLONE = 0x40049409
+
 
 class FileManager:
     @staticmethod
@@ -10,10 +17,33 @@ class FileManager:
 
     @staticmethod
     def generate_shot_path(project_path: str, production: str, division: str, ep: str, seq: str, shot: str) -> str:
-        shot_path = os.path.join(project_path, production, division, f"{ep}", f"{ep}_{seq}",
-                                 f"{ep}_{seq}_{shot}")
-        os.makedirs(shot_path, exist_ok=True)
-        return shot_path
+        # Pure path computation; folders are created by make_dirs only for shots that are generated
+        return os.path.join(project_path, production, division, f"{ep}", f"{ep}_{seq}", f"{ep}_{seq}_{shot}")
+
+    @staticmethod
+    def make_dirs(paths) -> dict[str, str]:
+        # Creates each folder once; returns {path: error} for the ones that could not be created
+        unique = {os.path.normpath(path) for path in paths if path}
+        # makedirs on a deeper folder creates its parents, so only the deepest folders are created
+        parents = {parent for path in unique for parent in FileManager._parents(path)}
+        failed = {}
+        for path in sorted(unique - parents):
+            try:
+                os.makedirs(path, exist_ok=True)
+            except OSError as e:
+                failed[path] = e.strerror or str(e)
+                # A requested parent of a failed folder may not exist either
+                for parent in FileManager._parents(path):
+                    if parent in unique:
+                        failed.setdefault(parent, failed[path])
+        return failed
+
+    @staticmethod
+    def _parents(path: str):
+        parent = os.path.dirname(path)
+        while parent and parent != path:
+            yield parent
+            path, parent = parent, os.path.dirname(parent)
 
     @staticmethod
     def generate_file_name(project_code: str, ep: str, seq: str, shot: str, division: str, extension: str) -> str:
@@ -38,31 +68,87 @@ class FileManager:
         return f"{base}_v{version:03d}{ext}"
 
     @staticmethod
-    def get_latest_version(progress_dir: str, shot_prefix: str, ext: str = ".blend") -> tuple[str, int, str] | tuple[
-        None, int, str]:
+    def get_latest_version(progress_dir: str, shot_prefix: str, ext: str = ".blend",
+                           refresh: bool = True) -> tuple[str, int, str] | tuple[None, int, str]:
         if shot_prefix.lower().endswith(ext.lower()):
             shot_prefix = shot_prefix[:-len(ext)]
 
-        pattern = re.compile(rf"^{re.escape(shot_prefix)}_v(\d+){re.escape(ext)}$")
-        latest_version = -1
-        latest_file = None
-
-        for filename in os.listdir(progress_dir):
-            match = pattern.match(filename)
-            if match:
-                version = int(match.group(1))
-                if version > latest_version:
-                    latest_version = version
-                    latest_file = filename
+        # Served from the shared scandir index. After VersionIndex.shared().scan() has listed many
+        # progress folders in parallel, refresh=False skips even the per-folder mtime check.
+        latest_version = VersionIndex.shared().latest_version(progress_dir, shot_prefix, ext, refresh=refresh)
 
         # Compute next version number
         next_version = latest_version + 1
         next_name = f"{shot_prefix}_v{next_version:03d}{ext}"
 
         # Return path of latest file (if any), current version number, and next filename
-        if latest_file:
+        if latest_version >= 0:
             return os.path.join(progress_dir, next_name), next_version, next_name
         else:
             # No files found, start at v000
             next_name = f"{shot_prefix}_v000{ext}"
             return None, -1, next_name
+
+    @staticmethod
+    def file_checksum(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _copy_contents(src: str, dst: str):
+        # copy_file_range lets NFS 4.2 / SMB servers copy without the data crossing the network
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            try:
+                while os.copy_file_range(fsrc.fileno(), fdst.fileno(), 1024 * 1024 * 64):
+                    pass
+                return
+            except (AttributeError, OSError):
+                fsrc.seek(0)
+                fdst.seek(0)
+                fdst.truncate()
+            shutil.copyfileobj(fsrc, fdst, 1024 * 1024)
+
+    @staticmethod
+    def copy_file(src: str, dst: str, mode: str = "copy") -> str:
+        # mode: "copy", "reflink" or "hardlink"; falls back to a plain copy when the filesystem
+        # cannot reflink or link. Returns the method actually used, raises OSError on failure.
+        # Every mode builds a temporary file and renames it over dst, so a reserved placeholder at dst
+        # is replaced atomically and never goes missing in between
+        tmp_path = f"{dst}.tmp{os.getpid()}"
+        if mode == "hardlink":
+            try:
+                os.link(src, tmp_path)
+                if not os.path.samefile(src, tmp_path):
+                    raise OSError(errno.EIO, f"Hard link does not point at {src}", dst)
+                os.replace(tmp_path, dst)
+                return "hardlink"
+            except OSError as e:
+                if os.path.lexists(tmp_path):
+                    os.remove(tmp_path)
+                if e.errno not in (errno.EXDEV, errno.EPERM, errno.EOPNOTSUPP, errno.EMLINK):
+                    raise
+        used = "copy"
+        try:
+            if mode == "reflink":
+                try:
+                    import fcntl
+                    with open(src, "rb") as fsrc, open(tmp_path, "wb") as fdst:
+                        fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+                    used = "reflink"
+                except ImportError:  # Windows has no FICLONE; copied below instead
+                    pass
+                except OSError as e:
+                    if e.errno not in (errno.EXDEV, errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL):
+                        raise
+            if used == "copy":
+                FileManager._copy_contents(src, tmp_path)
+            if FileManager.file_checksum(src) != FileManager.file_checksum(tmp_path):
+                raise OSError(errno.EIO, "Checksum mismatch after copy", dst)
+            os.replace(tmp_path, dst)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return used
@@ -0,0 +1,169 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+from app.config import Config
+from app.services.blender_settings import APPLY_PRESET_SCRIPT
+from app.services.json_manager import JSONManager
+
+# Params that decide what a shot's output looks like. The progress path is left out on purpose:
+# apply-preset picks a new version every run, and the copy modes leave it empty.
+FINGERPRINT_KEYS = ("master_file", "animation_file", "start_frame", "end_frame", "output_path", "output_node",
+                    "method", "collection_list", "camera_collection", "character_collection", "scene_name",
+                    "crypto_node", "json_preset_filepath", "blend_preset_filepath", "lighting_plugin_key")
+INPUT_KEYS = ("master_file", "animation_file", "json_preset_filepath", "blend_preset_filepath")
+OUTPUT_KEYS = ("output_path", "output_path_progress")
+
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+STATUS_CANCELLED = "cancelled"
+
+
+class JobJournal:
+    # One JSON line per shot and run:
+    #   {"key", "shot", "job", "script", "params", "status", "fingerprint", "inputs", "outputs", "time"}
+    # params are the shot's own params (a batch's shared settings merged with the shot's record), kept
+    # so a failed shot can be inspected or replayed. inputs/outputs map each path to its mtime when
+    # the run ended; the newest line per key wins. Several processes may share the file: appends and
+    # compaction hold the same lock (JSONManager.locked).
+    def __init__(self, path: str = Config.JOURNAL_PATH, on_done=None):
+        # on_done(shot name) is called for every shot recorded as done, from the pool's worker threads
+        self.path = path
+        self.on_done = on_done
+        self._lock = threading.Lock()
+        self._latest = {}
+        self._load()
+
+    def _read(self, latest: dict) -> int:
+        # Fills latest with the newest entry per key; returns the number of lines read
+        lines = 0
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    lines += 1
+                    latest[entry["key"]] = entry
+        except FileNotFoundError:
+            pass
+        return lines
+
+    def _load(self):
+        lines = self._read(self._latest)
+        if lines > 2 * len(self._latest) + 1000:
+            self._compact()
+
+    def _compact(self):
+        # Keeps only the newest line per shot. The file is read again under the lock, so lines another
+        # run appended since _load are kept, and replaced atomically so readers never see half a file.
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with JSONManager.locked(self.path):
+                latest = {}
+                self._read(latest)
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    for entry in latest.values():
+                        f.write(json.dumps(entry) + "\n")
+                os.replace(tmp_path, self.path)
+            self._latest = latest
+        except OSError as e:
+            print(f"[WARNING] Could not compact the job journal: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    @staticmethod
+    def shot_params(name: str, script: str, params: dict):
+        # Yields (journal key, shot name, params of that shot) for single-shot and batch jobs alike
+        kind = "apply_preset" if script == APPLY_PRESET_SCRIPT else "lighting"
+        if "shots" not in params:
+            yield f"{kind}:{name}", name, params
+            return
+        shared = {key: value for key, value in params.items() if key != "shots"}
+        for shot in params["shots"]:
+            yield f"{kind}:{shot['name']}", shot["name"], dict(shared, **shot)
+
+    @staticmethod
+    def fingerprint(params: dict) -> str:
+        # Empty and missing values compare equal: a batch passes "" for the preset params a plain
+        # single-shot job leaves out
+        values = {key: params.get(key) or None for key in FINGERPRINT_KEYS}
+        return hashlib.sha1(json.dumps(values, sort_keys=True).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _paths(params: dict, keys: tuple) -> list[str]:
+        return [params[key] for key in keys if params.get(key)]
+
+    @staticmethod
+    def _mtimes(paths) -> dict[str, int | None]:
+        mtimes = {}
+        for path in paths:
+            try:
+                mtimes[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                mtimes[path] = None
+        return mtimes
+
+    def record(self, name: str, script: str, params: dict, status: str, stale_outputs=()):
+        # stale_outputs: expected outputs the last attempt did not write. When a batch job fails,
+        # its shots whose files were all written still count as done, unless their progress
+        # version was left to the post-job copy that a failed job skips.
+        stale_outputs = set(stale_outputs)
+        lines = []
+        done = []
+        for key, shot, shot_params in self.shot_params(name, script, params):
+            shot_status = status
+            if status == STATUS_FAILED and "shots" in params and shot_params.get("output_path_progress"):
+                if not stale_outputs.intersection(self._paths(shot_params, OUTPUT_KEYS)):
+                    shot_status = STATUS_DONE
+            entry = {
+                "key": key,
+                "shot": shot,
+                "job": name,
+                "script": script,
+                "params": shot_params,
+                "status": shot_status,
+                "fingerprint": self.fingerprint(shot_params),
+                "inputs": self._mtimes(self._paths(shot_params, INPUT_KEYS)),
+                "outputs": self._mtimes(self._paths(shot_params, OUTPUT_KEYS)),
+                "time": time.time(),
+            }
+            lines.append(json.dumps(entry) + "\n")
+            if shot_status == STATUS_DONE:
+                done.append(shot)
+            with self._lock:
+                self._latest[key] = entry
+        try:
+            with self._lock, JSONManager.locked(self.path), open(self.path, "a", encoding="utf-8") as f:
+                f.writelines(lines)
+        except OSError as e:
+            print(f"[WARNING] Could not write the job journal: {e}")
+        if self.on_done:
+            for shot in done:
+                self.on_done(shot)
+
+    def is_complete(self, key: str, params: dict) -> bool:
+        # Done last time with the same params, and no input or output has changed since
+        with self._lock:
+            entry = self._latest.get(key)
+        if not entry or entry["status"] != STATUS_DONE or entry["fingerprint"] != self.fingerprint(params):
+            return False
+        for recorded in (entry["inputs"], entry["outputs"]):
+            current = self._mtimes(recorded)
+            if None in current.values() or current != recorded:
+                return False
+        return True
+
+    def completed(self, jobs) -> set[str]:
+        # jobs: [(name, script, params), ...] -> names of the shots a resumed batch can skip
+        done = set()
+        for name, script, params in jobs:
+            for key, shot, shot_params in self.shot_params(name, script, params):
+                if self.is_complete(key, shot_params):
+                    done.add(shot)
+        return done
@@ -0,0 +1,142 @@
+import json
+import os
+import re
+import shutil
+import threading
+import time
+
+from app.config import Config
+
+INDEX_FILE = "index.jsonl"
+BATCHES_DIR = "batches"
+
+
+class JobLog:
+    # One job's Blender output, written as it streams in and rotated by size
+    def __init__(self, path: str, max_bytes: int, backup_count: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._file = open(path, "a", encoding="utf-8", errors="replace")
+        self._size = self._file.tell()
+
+    def write(self, text: str):
+        if self._file is None:
+            return
+        # The cap is in bytes; non-ASCII output takes more bytes than characters
+        size = len(text.encode("utf-8", errors="replace"))
+        if self.max_bytes > 0 and self._size and self._size + size > self.max_bytes:
+            self._rotate()
+        self._file.write(text)
+        self._size += size
+
+    def _rotate(self):
+        # job.log -> job.log.1 -> ... -> job.log.N; the oldest is dropped
+        self._file.close()
+        for index in range(self.backup_count - 1, 0, -1):
+            older = f"{self.path}.{index}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{index + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        self._file = open(self.path, "w", encoding="utf-8", errors="replace")
+        self._size = 0
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class JobLogs:
+    # Logs of one batch under <root>/batches/<batch id>/, plus a shared index.jsonl with one
+    # line per finished job: {"batch", "job", "shots", "log", "exit_code", "ok", "started", "finished"}
+    def __init__(self, root: str = Config.LOG_PATH, max_bytes: int = Config.LOG_MAX_BYTES,
+                 backup_count: int = Config.LOG_BACKUP_COUNT):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        # The pid keeps batches started in the same second by the GUI and the CLI apart
+        self.batch_id = f"{time.strftime('%Y%m%d_%H%M%S')}_{os.getpid()}"
+        self.batch_dir = os.path.join(root, BATCHES_DIR, self.batch_id)
+        self._lock = threading.Lock()
+        self._started = {}
+
+    @staticmethod
+    def _file_name(job: str) -> str:
+        # Batch job names contain "/" and spaces
+        return re.sub(r"[^\w.-]+", "_", job).strip("_") or "job"
+
+    def open(self, job: str) -> JobLog:
+        os.makedirs(self.batch_dir, exist_ok=True)
+        log = JobLog(os.path.join(self.batch_dir, self._file_name(job) + ".log"), self.max_bytes,
+                     self.backup_count)
+        with self._lock:
+            self._started[log.path] = time.time()
+        return log
+
+    def finish(self, job: str, log: JobLog, exit_code: int | None, ok: bool, shots: list[str] | None = None):
+        # exit_code is None when the job ran inside a persistent worker
+        log.close()
+        with self._lock:
+            started = self._started.pop(log.path, None)
+        entry = {
+            "batch": self.batch_id,
+            "job": job,
+            "shots": shots or [job],
+            "log": log.path,
+            "exit_code": exit_code,
+            "ok": ok,
+            "started": started,
+            "finished": time.time(),
+        }
+        # One short append per job; the index is shared with other batches and processes
+        try:
+            with self._lock, open(os.path.join(self.root, INDEX_FILE), "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+        except OSError as e:
+            print(f"[WARNING] Could not update the log index: {e}")
+
+    @staticmethod
+    def read_index(root: str = Config.LOG_PATH) -> list[dict]:
+        entries = []
+        try:
+            with open(os.path.join(root, INDEX_FILE), encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        continue
+        except FileNotFoundError:
+            pass
+        return entries
+
+    @staticmethod
+    def find(shot: str, root: str = Config.LOG_PATH) -> list[dict]:
+        # Index entries of every batch that built the shot, newest first
+        return [entry for entry in reversed(JobLogs.read_index(root)) if shot in entry.get("shots", ())]
+
+    @staticmethod
+    def prune(root: str = Config.LOG_PATH, keep_batches: int = Config.LOG_KEEP_BATCHES):
+        # Drops the oldest batch folders and their index entries; batch ids sort by start time
+        batches_path = os.path.join(root, BATCHES_DIR)
+        try:
+            batches = sorted(entry.name for entry in os.scandir(batches_path) if entry.is_dir())
+        except FileNotFoundError:
+            return
+        removed = set(batches[:-keep_batches] if keep_batches > 0 else batches)
+        if not removed:
+            return
+        for batch in removed:
+            shutil.rmtree(os.path.join(batches_path, batch), ignore_errors=True)
+
+        index_path = os.path.join(root, INDEX_FILE)
+        kept = [entry for entry in JobLogs.read_index(root) if entry.get("batch") not in removed]
+        tmp_path = f"{index_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for entry in kept:
+                    f.write(json.dumps(entry) + "\n")
+            os.replace(tmp_path, index_path)
+        except OSError as e:
+            print(f"[WARNING] Could not prune the log index: {e}")
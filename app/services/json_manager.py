@@ -1,10 +1,26 @@
+import atexit
 import json
 import os
+import tempfile
+import threading
+from contextlib import contextmanager
+
+from app.config import Config
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:  # POSIX
+    msvcrt = None
 
 
 class JSONManager:
     @staticmethod
     def read_json(file_path):
+        # Writers replace the file atomically, so a reader sees the old or the new config, never half of it
         try:
             with open(file_path, 'r') as file:
                 return json.load(file)
@@ -13,17 +29,109 @@ class JSONManager:
         except json.JSONDecodeError:
             return {}
 
+    @staticmethod
+    @contextmanager
+    def locked(file_path):
+        # Advisory lock on a sidecar file, held for a whole read-merge-write; the config itself is
+        # replaced on every write, so it cannot carry the lock
+        with open(file_path + ".lock", "a") as lock_file:
+            JSONManager._lock_file(lock_file, True)
+            try:
+                yield
+            finally:
+                JSONManager._lock_file(lock_file, False)
+
+    @staticmethod
+    def _lock_file(lock_file, lock: bool):
+        # flock on POSIX; on Windows msvcrt locks the file's first byte, and LK_LOCK gives up
+        # with OSError after about 10 seconds, which the callers report like a failed write
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX if lock else fcntl.LOCK_UN)
+        elif msvcrt is not None:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK if lock else msvcrt.LK_UNLCK, 1)
+
+    @staticmethod
+    def _replace(file_path, data):
+        # Temp file in the same folder, flushed to disk, then renamed over the config
+        folder = os.path.dirname(os.path.abspath(file_path))
+        fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(file_path) + ".", suffix=".tmp", dir=folder)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
     @staticmethod
     def write_json(file_path, data):
-        existing_data = {}
-        if os.path.exists(file_path):
-            with open(file_path, 'r') as f:
-                try:
-                    existing_data = json.load(f)
-                except json.JSONDecodeError:
-                    existing_data = {}
-
-        existing_data.update(data)
-
-        with open(file_path, 'w') as f:
-            json.dump(existing_data, f, indent=4)
+        # Merges top-level keys into what is on disk now, so concurrent writers keep each other's keys
+        with JSONManager.locked(file_path):
+            existing_data = JSONManager.read_json(file_path)
+            existing_data.update(data)
+            JSONManager._replace(file_path, existing_data)
+
+    @staticmethod
+    def read_section(file_path, section: str) -> dict:
+        data = JSONManager.read_json(file_path).get(section)
+        return data if isinstance(data, dict) else {}
+
+    @staticmethod
+    def write_section(file_path, section: str, values: dict):
+        # Each tool owns one section; keys it does not know about are left alone
+        with JSONManager.locked(file_path):
+            existing_data = JSONManager.read_json(file_path)
+            current = existing_data.get(section)
+            existing_data[section] = {**(current if isinstance(current, dict) else {}), **values}
+            JSONManager._replace(file_path, existing_data)
+
+
+class ConfigSection:
+    # One tool's namespace in a shared config file. The section is read once and kept in memory;
+    # update() only schedules a write, so a burst of changes (typing in a field) becomes one
+    # locked merge into the file after `delay` seconds of quiet. Pending changes are written at exit.
+    def __init__(self, file_path: str, section: str, delay: float = Config.CONFIG_SAVE_DELAY):
+        self.file_path = file_path
+        self.section = section
+        self.delay = delay
+        self._values = JSONManager.read_section(file_path, section)
+        self._dirty = False
+        self._timer = None
+        self._lock = threading.Lock()
+        atexit.register(self.flush)
+
+    @property
+    def values(self) -> dict:
+        with self._lock:
+            return dict(self._values)
+
+    def update(self, values: dict):
+        with self._lock:
+            if all(self._values.get(key, object()) == value for key, value in values.items()):
+                return
+            self._values.update(values)
+            self._dirty = True
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return
+            try:
+                JSONManager.write_section(self.file_path, self.section, dict(self._values))
+                self._dirty = False
+            except OSError as e:
+                print(f"[WARNING] Could not save config {self.file_path}: {e}")
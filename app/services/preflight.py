@@ -0,0 +1,103 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# Check kinds
+FILE = "file"
+DIRECTORY = "directory"
+EXECUTABLE = "executable"
+
+
+class PreflightReport:
+    def __init__(self):
+        self.batch_problems = []  # problems shared by every shot (mastershot, presets, Blender)
+        self.shot_problems = {}  # shot name -> [problem, ...]
+
+    @property
+    def ok(self) -> bool:
+        return not self.batch_problems and not self.shot_problems
+
+    def add(self, message: str, shot: str | None = None):
+        if shot is None:
+            self.batch_problems.append(message)
+        else:
+            self.shot_problems.setdefault(shot, []).append(message)
+
+    def format(self, max_shots: int = 0) -> str:
+        lines = list(self.batch_problems)
+        shots = list(self.shot_problems.items())
+        if max_shots > 0 and len(shots) > max_shots:
+            hidden, shots = len(shots) - max_shots, shots[:max_shots]
+        else:
+            hidden = 0
+        for shot, problems in shots:
+            lines.append(f"{shot}:")
+            lines.extend(f"  - {problem}" for problem in problems)
+        if hidden:
+            lines.append(f"... and {hidden} more shot(s)")
+        return "\n".join(lines)
+
+
+class Preflight:
+    # Checks every input and output location of a batch before Blender is launched.
+    # NAS round trips dominate, so unique paths are checked once each on a thread pool.
+    def __init__(self, max_workers: int = 16):
+        self.max_workers = max_workers
+
+    @staticmethod
+    def check_path(kind: str, path: str) -> str | None:
+        # Returns None when usable, otherwise a short reason
+        if not path:
+            return "path is empty"
+        if kind == FILE:
+            if not os.path.isfile(path):
+                return f"not found: {path}"
+            try:
+                with open(path, "rb"):
+                    pass
+            except OSError as e:
+                return f"not readable: {path} ({e.strerror})"
+            return None
+        if kind == EXECUTABLE:
+            if not os.path.isfile(path):
+                return f"not found: {path}"
+            if not os.access(path, os.X_OK):
+                return f"not executable: {path}"
+            return None
+        if kind == DIRECTORY:
+            # Output folders may not exist yet; the nearest existing parent must be a writable folder
+            existing = path
+            while not os.path.exists(existing):
+                parent = os.path.dirname(existing)
+                if parent == existing:
+                    break
+                existing = parent
+            if not os.path.isdir(existing):
+                return f"not a folder: {existing}"
+            if not os.access(existing, os.W_OK | os.X_OK):
+                return f"not writable: {existing}"
+            return None
+        raise ValueError(f"Unknown preflight check kind: {kind}")
+
+    def run(self, batch_checks: list[tuple[str, str, str]],
+            shot_checks: dict[str, list[tuple[str, str, str]]]) -> PreflightReport:
+        # checks: [(label, kind, path), ...]; shot_checks keyed by shot name
+        unique = {(kind, path) for _, kind, path in batch_checks}
+        for checks in shot_checks.values():
+            unique.update((kind, path) for _, kind, path in checks)
+
+        unique = list(unique)
+        workers = max(1, min(self.max_workers, len(unique)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="preflight") as executor:
+            results = dict(zip(unique, executor.map(lambda check: self.check_path(*check), unique)))
+
+        report = PreflightReport()
+        for label, kind, path in batch_checks:
+            reason = results[(kind, path)]
+            if reason:
+                report.add(f"{label} {reason}")
+        for shot, checks in shot_checks.items():
+            for label, kind, path in checks:
+                reason = results[(kind, path)]
+                if reason:
+                    report.add(f"{label} {reason}", shot=shot)
+        return report
@@ -0,0 +1,39 @@
+import threading
+
+from app.services.file_manager import FileManager
+
+# "save": Blender writes the progress version itself (second save_as_mainfile).
+# The other modes save once and copy the lighting file after Blender exits. The copy is
+# byte-identical and lives one folder deeper, so those jobs save the lighting file with
+# absolute paths (BlenderSettings' absolute_paths) for the copy's links to resolve.
+PROGRESS_COPY_MODES = ("save", "copy", "reflink", "hardlink")
+
+
+class ProgressCopier:
+    # Produces progress versions after a Blender job succeeds; called from pool worker threads
+    def __init__(self, mode: str = "save"):
+        if mode not in PROGRESS_COPY_MODES:
+            raise ValueError(f"Unknown progress copy mode: {mode!r}")
+        self.mode = mode
+        self._copies = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "save"
+
+    def add(self, job_name: str, src: str, dst: str):
+        with self._lock:
+            self._copies.setdefault(job_name, []).append((src, dst))
+
+    def __call__(self, job_name: str) -> bool:
+        with self._lock:
+            copies = self._copies.pop(job_name, [])
+        for src, dst in copies:
+            try:
+                used = FileManager.copy_file(src, dst, mode=self.mode)
+            except OSError as e:
+                print(f"[ERROR] Could not create progress version {dst}: {e}")
+                return False
+            print(f"Progress version ({used}, verified): {dst}")
+        return True
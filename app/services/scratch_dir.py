@@ -0,0 +1,84 @@
+import atexit
+import itertools
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+
+from app.config import Config
+
+FAILED_DIR = "failed"
+
+
+class ScratchDir:
+    # Private folder for one batch's job payloads. A payload is deleted once its job succeeds and
+    # moved to failed/ when it does not; the folder goes away with the batch, or at interpreter
+    # exit, unless it holds failed payloads. Safe to share between the pool's worker threads.
+    def __init__(self, root: str = Config.SCRATCH_PATH):
+        os.makedirs(root, exist_ok=True)
+        # mkdtemp gives every batch, in this or another process, its own folder
+        self.path = tempfile.mkdtemp(prefix=time.strftime("%Y%m%d_%H%M%S_"), dir=root)
+        self.failed_dir = os.path.join(self.path, FAILED_DIR)
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+        atexit.register(self.cleanup)
+
+    def write_payload(self, job: str, script: str, params: dict) -> str:
+        with self._lock:
+            number = next(self._counter)
+        # The counter keeps names unique; the job name only makes the folder readable
+        safe_name = re.sub(r"[^\w.-]+", "_", job).strip("_")
+        path = os.path.join(self.path, f"{number:05d}_{safe_name}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"script": script, "params": params}, f)
+        return path
+
+    def release(self, path: str, ok: bool) -> str | None:
+        # Returns where a failed job's payload was kept
+        try:
+            if ok:
+                os.remove(path)
+                return None
+            os.makedirs(self.failed_dir, exist_ok=True)
+            kept = os.path.join(self.failed_dir, os.path.basename(path))
+            os.replace(path, kept)
+            return kept
+        except OSError as e:
+            print(f"[WARNING] Could not clean up {path}: {e}")
+            return None
+
+    def cleanup(self):
+        # Removes everything but failed payloads; idempotent, also registered with atexit
+        atexit.unregister(self.cleanup)
+        try:
+            entries = list(os.scandir(self.path))
+        except FileNotFoundError:
+            return
+        for entry in entries:
+            if entry.name != FAILED_DIR:
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+        try:
+            os.rmdir(self.path)  # only succeeds when no failed payloads were kept
+        except OSError:
+            pass
+
+    @staticmethod
+    def prune(root: str = Config.SCRATCH_PATH, keep_days: float = Config.SCRATCH_KEEP_DAYS):
+        # Drops batch folders older than keep_days, including ones left behind by a crashed process
+        cutoff = time.time() - keep_days * 86400
+        try:
+            entries = list(os.scandir(root))
+        except FileNotFoundError:
+            return
+        for entry in entries:
+            try:
+                if entry.is_dir() and entry.stat().st_mtime < cutoff:
+                    shutil.rmtree(entry.path, ignore_errors=True)
+            except OSError:
+                pass
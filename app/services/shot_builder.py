@@ -0,0 +1,262 @@
+import os
+
+from app.data.project import division_list
+from app.data.blender_config import collection_list, camera_collection_name, scene_name, cryptomatte_node, \
+    character_collection_name, output_node, lighting_plugin_key
+from app.services.blender_settings import BlenderSettings
+from app.services.file_manager import FileManager
+from app.services.preflight import FILE, DIRECTORY, EXECUTABLE
+from app.services.progress_copy import ProgressCopier
+from app.services.shot_index import ShotRecord
+from app.services.version_index import VersionIndex
+
+
+class ShotBuilder:
+    # Qt-free per-shot path and script building shared by the GUI tabs and the CLI
+    def __init__(self, project_data: list):
+        self.project_data = project_data
+        self.project_code = project_data[2]
+        self.project_production_path = FileManager.get_project_path(project_data[0])
+        self.project_output_path = FileManager.get_project_path(project_data[-1])
+
+    def lighting_shot(self, record: ShotRecord) -> dict:
+        ep, seq, shot, shot_file = record.ep, record.seq, record.shot, record.file_name
+        # Get animation file
+        animation_path = FileManager.generate_shot_path(project_path=self.project_production_path,
+                                                        production=division_list[0][2],
+                                                        division=division_list[0][3], ep=ep, seq=seq, shot=shot)
+        animation_name = FileManager.generate_file_name(project_code=self.project_code, ep=ep, seq=seq, shot=shot,
+                                                        division=division_list[0][0], extension="blend")
+        animation_file = FileManager.combine_paths(animation_path, animation_name)
+
+        # Generate lighting path
+        lighting_path = FileManager.generate_shot_path(project_path=self.project_production_path,
+                                                       production=division_list[1][2],
+                                                       division=division_list[1][3], ep=ep, seq=seq, shot=shot)
+        lighting_file = FileManager.combine_paths(lighting_path, shot_file)
+        lighting_progress_dir = FileManager.combine_paths(lighting_path, "progress")
+        versioned_name = FileManager.add_version_to_filename(shot_file, version=0)
+        lighting_progress_file = FileManager.combine_paths(str(lighting_progress_dir), versioned_name)
+
+        output_node_data = []
+        for node_name, export_type in zip(output_node, ("comp", "preview")):
+            path, filename = FileManager.generate_png_comp(project_code=self.project_code,
+                                                           project_path=self.project_output_path,
+                                                           ep=ep, seq=seq, shot=shot,
+                                                           file_type="png", export_type=export_type)
+            output_node_data.append((node_name, path, filename))
+
+        return {
+            "name": shot_file,
+            "animation_file": str(animation_file),
+            "start_frame": record.start_frame,
+            "end_frame": record.end_frame,
+            "output_path": str(lighting_file),
+            "output_path_progress": str(lighting_progress_file),
+            "output_node": output_node_data,
+        }
+
+    @staticmethod
+    def lighting_preflight(shot: dict) -> list[tuple[str, str, str]]:
+        checks = [
+            ("Animation file", FILE, shot["animation_file"]),
+            ("Lighting folder", DIRECTORY, os.path.dirname(shot["output_path"])),
+            ("Progress folder", DIRECTORY, os.path.dirname(shot["output_path_progress"])),
+        ]
+        checks.extend((f"Output folder ({node_name})", DIRECTORY, path) for node_name, path, _ in shot["output_node"])
+        return checks
+
+    @staticmethod
+    def batch_preflight(blender_path: str, mastershot_path: str = "", blend_preset_filepath: str = "",
+                        json_preset_filepath: str = "") -> list[tuple[str, str, str]]:
+        # Inputs shared by every shot; empty optional paths are not checked
+        checks = [("Blender executable", EXECUTABLE, blender_path)]
+        for label, path in (("Mastershot file", mastershot_path), ("Preset blend file", blend_preset_filepath),
+                            ("Preset JSON file", json_preset_filepath)):
+            if path:
+                checks.append((label, FILE, path))
+        return checks
+
+    @staticmethod
+    def lighting_output_dirs(shot: dict) -> list[str]:
+        return [os.path.dirname(shot["output_path"]), os.path.dirname(shot["output_path_progress"])]
+
+    @staticmethod
+    def materialise_dirs(shots: list[dict], output_dirs) -> dict[str, str]:
+        # One batched folder creation for the shots that will actually run; returns {shot name: error}
+        failed_dirs = FileManager.make_dirs(path for shot in shots for path in output_dirs(shot))
+        failed = {}
+        if not failed_dirs:
+            return failed
+        for shot in shots:
+            for path in output_dirs(shot):
+                error = failed_dirs.get(os.path.normpath(path))
+                if error:
+                    failed[shot["name"]] = f"Could not create {path}: {error}"
+                    break
+        return failed
+
+    @staticmethod
+    def _progress_path(shot: dict, job_name: str, src: str, copier: ProgressCopier | None) -> str:
+        # With a copier the script saves once and the progress version is copied after Blender exits
+        if copier is None or not copier.enabled:
+            return shot["output_path_progress"]
+        copier.add(job_name, src, shot["output_path_progress"])
+        return ""
+
+    @staticmethod
+    def _absolute_paths(copier: ProgressCopier | None) -> bool:
+        # A copied progress version sits one folder below the lighting file, where relative paths
+        # no longer resolve, so the lighting file keeps its paths absolute
+        return copier is not None and copier.enabled
+
+    @staticmethod
+    def lighting_job(shot: dict, mastershot_path: str, link: bool, apply_preset: bool = False,
+                     blend_preset_filepath: str = "", json_preset_filepath: str = "",
+                     copier: ProgressCopier | None = None) -> tuple[str, str, dict]:
+        # (job name, script name, params); only the script the shot needs is picked
+        output_path_progress = ShotBuilder._progress_path(shot, shot["name"], shot["output_path"], copier)
+        if apply_preset:
+            return shot["name"], *BlenderSettings.generate_lighting_with_light_script(
+                master_file=mastershot_path,
+                animation_file=shot["animation_file"],
+                collection_list=collection_list,
+                camera_collection=camera_collection_name,
+                character_collection=character_collection_name,
+                start_frame=shot["start_frame"],
+                end_frame=shot["end_frame"],
+                output_path=shot["output_path"],
+                output_path_progress=output_path_progress,
+                scene_name=scene_name,
+                crypto_node=cryptomatte_node,
+                output_node=shot["output_node"],
+                method=link,
+                blend_preset_filepath=blend_preset_filepath,
+                json_preset_filepath=json_preset_filepath,
+                lighting_plugin_key=lighting_plugin_key,
+                absolute_paths=ShotBuilder._absolute_paths(copier)
+            )
+        return shot["name"], *BlenderSettings.generate_lighting_script(
+            master_file=mastershot_path,
+            animation_file=shot["animation_file"],
+            collection_list=collection_list,
+            camera_collection=camera_collection_name,
+            character_collection=character_collection_name,
+            start_frame=shot["start_frame"],
+            end_frame=shot["end_frame"],
+            output_path=shot["output_path"],
+            output_path_progress=output_path_progress,
+            scene_name=scene_name,
+            crypto_node=cryptomatte_node,
+            output_node=shot["output_node"],
+            method=link,
+            absolute_paths=ShotBuilder._absolute_paths(copier)
+        )
+
+    @staticmethod
+    def batch_jobs(shots: list, workers: int, mastershot_path: str, link: bool, apply_preset: bool = False,
+                   blend_preset_filepath: str = "", json_preset_filepath: str = "",
+                   copier: ProgressCopier | None = None) -> list[tuple[str, str, dict]]:
+        # Spread the shots round-robin over one batch script per worker
+        if not apply_preset:
+            # Like lighting_job, a plain lighting run carries no preset params, so the journal and
+            # fingerprints see the same shot params whichever way it ran
+            blend_preset_filepath = json_preset_filepath = ""
+        chunk_count = max(1, min(workers, len(shots)))
+        jobs = []
+        for chunk_index in range(chunk_count):
+            chunk = shots[chunk_index::chunk_count]
+            job_name = f"Batch {chunk_index + 1}/{chunk_count} ({len(chunk)} shots)"
+            chunk = [dict(shot, output_path_progress=ShotBuilder._progress_path(
+                shot, job_name, shot["output_path"], copier)) for shot in chunk]
+            batch_script, params = BlenderSettings.generate_batch_lighting_script(
+                master_file=mastershot_path,
+                shots=chunk,
+                collection_list=collection_list,
+                camera_collection=camera_collection_name,
+                character_collection=character_collection_name,
+                scene_name=scene_name,
+                crypto_node=cryptomatte_node,
+                method=link,
+                apply_preset=apply_preset,
+                blend_preset_filepath=blend_preset_filepath,
+                json_preset_filepath=json_preset_filepath,
+                lighting_plugin_key=lighting_plugin_key if apply_preset else "",
+                absolute_paths=ShotBuilder._absolute_paths(copier)
+            )
+            jobs.append((job_name, batch_script, params))
+        return jobs
+
+    def _lighting_path(self, record: ShotRecord) -> str:
+        return FileManager.generate_shot_path(project_path=self.project_production_path,
+                                              production=division_list[1][2],
+                                              division=division_list[1][3], ep=record.ep, seq=record.seq,
+                                              shot=record.shot)
+
+    def apply_preset_shots(self, records: list[ShotRecord]) -> list[dict]:
+        # Lists every progress folder once, in parallel, then resolves each next version from the index
+        VersionIndex.shared().scan(os.path.join(self._lighting_path(record), "progress") for record in records)
+        return [self.apply_preset_shot(record, refresh=False) for record in records]
+
+    def apply_preset_shot(self, record: ShotRecord, refresh: bool = True) -> dict:
+        shot_file = record.file_name
+        lighting_path = self._lighting_path(record)
+        lighting_file = FileManager.combine_paths(lighting_path, shot_file)
+        lighting_progress_dir = FileManager.combine_paths(lighting_path, "progress")
+        next_path, next_version, next_filename = FileManager.get_latest_version(
+            progress_dir=str(lighting_progress_dir), shot_prefix=shot_file, ext=".blend", refresh=refresh)
+        print(f"Next version path: {next_path}, next version: {next_version}, next filename: {next_filename}")
+        if next_path is None:
+            # No versions yet; start at v000 instead of saving to a path named "None"
+            next_path = FileManager.combine_paths(str(lighting_progress_dir), next_filename)
+        return {
+            "name": shot_file,
+            "lighting_file": str(lighting_file),
+            "output_path_progress": str(next_path),
+            "progress_dir": str(lighting_progress_dir),
+        }
+
+    @staticmethod
+    def reserve_progress_versions(shots: list[dict]) -> dict[str, str]:
+        # Claims each shot's progress version on disk right before the jobs are built, so parallel jobs
+        # and other machines never pick the same number. Updates the shots; returns {shot name: error}.
+        failed = {}
+        for shot in shots:
+            stem, ext = os.path.splitext(os.path.basename(shot["lighting_file"]))
+            try:
+                shot["output_path_progress"], _ = VersionIndex.shared().reserve(shot["progress_dir"], stem, ext)
+            except OSError as e:
+                failed[shot["name"]] = f"Could not reserve a progress version in {shot['progress_dir']}: {e}"
+        return failed
+
+    @staticmethod
+    def release_progress_versions(shots: list[dict]):
+        # After the batch: frees the reservations of jobs that failed or never ran
+        for shot in shots:
+            if VersionIndex.release(shot["output_path_progress"]):
+                print(f"Released unused progress version {shot['output_path_progress']}")
+
+    @staticmethod
+    def apply_preset_preflight(shot: dict) -> list[tuple[str, str, str]]:
+        return [
+            ("Lighting file", FILE, shot["lighting_file"]),
+            ("Progress folder", DIRECTORY, shot["progress_dir"]),
+        ]
+
+    @staticmethod
+    def apply_preset_output_dirs(shot: dict) -> list[str]:
+        return [shot["progress_dir"]]
+
+    @staticmethod
+    def apply_preset_job(shot: dict, blend_preset_filepath: str, json_preset_filepath: str,
+                         copier: ProgressCopier | None = None) -> tuple[str, str, dict]:
+        return shot["name"], *BlenderSettings.generate_apply_preset_script(
+            master_file=shot["lighting_file"],
+            character_collection=character_collection_name,
+            output_path=shot["lighting_file"],
+            output_path_progress=ShotBuilder._progress_path(shot, shot["name"], shot["lighting_file"], copier),
+            blend_preset_filepath=blend_preset_filepath,
+            json_preset_filepath=json_preset_filepath,
+            lighting_plugin_key=lighting_plugin_key,
+            absolute_paths=ShotBuilder._absolute_paths(copier)
+        )
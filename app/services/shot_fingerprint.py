@@ -0,0 +1,104 @@
+import hashlib
+import json
+import os
+import threading
+from functools import lru_cache
+
+from app.services.blender_settings import RAW_SCRIPT_DIR, SHOT_LIBRARY
+from app.services.job_journal import JobJournal
+from app.services.shot_index import ShotRecord
+
+SIDECAR_SUFFIX = ".sbbc.json"
+FINGERPRINT_VERSION = 1
+
+
+class ShotFingerprints:
+    # What each lighting file was built from, stored as <lighting file>.sbbc.json next to it so
+    # any machine can tell whether a shot needs rebuilding. Written from pool worker threads.
+    def __init__(self):
+        self._current = {}  # shot name -> fingerprint of this run's inputs
+        self._outputs = {}  # shot name -> lighting file
+        self._lock = threading.Lock()
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def script_version(script: str) -> str:
+        # The script and the shared library it runs, so an edit to either rebuilds the shot
+        digest = hashlib.sha1()
+        try:
+            for name in (script, SHOT_LIBRARY):
+                digest.update((RAW_SCRIPT_DIR / name).read_bytes())
+        except OSError:
+            return ""
+        return digest.hexdigest()[:12]
+
+    @staticmethod
+    def _mtime(path: str) -> int | None:
+        if not path:
+            return None
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    @staticmethod
+    def compute(script: str, params: dict, record: ShotRecord) -> dict:
+        # Taken before the run, so an input that changes while Blender works forces the next rebuild
+        return {
+            "version": FINGERPRINT_VERSION,
+            "script": script,
+            "script_version": ShotFingerprints.script_version(script),
+            "master_file": params.get("master_file"),
+            "master_mtime": ShotFingerprints._mtime(params.get("master_file")),
+            "animation_file": params.get("animation_file"),
+            "animation_mtime": ShotFingerprints._mtime(params.get("animation_file")),
+            "preset_mtimes": [ShotFingerprints._mtime(params.get(key))
+                              for key in ("blend_preset_filepath", "json_preset_filepath")],
+            "csv_row": [record.ep, record.seq, record.shot, record.start_frame, record.end_frame, *record.extra],
+            "params": JobJournal.fingerprint(params),
+        }
+
+    @staticmethod
+    def sidecar_path(output_path: str) -> str:
+        return output_path + SIDECAR_SUFFIX
+
+    @staticmethod
+    def read(output_path: str) -> dict | None:
+        try:
+            with open(ShotFingerprints.sidecar_path(output_path), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def add(self, job: tuple[str, str, dict], record: ShotRecord, script: str | None = None):
+        # job: the shot's single-shot (name, script, params), as built by ShotBuilder.lighting_job.
+        # script: the script that will actually build the shot, when it is not the job's own (a batch run)
+        name, job_script, params = job
+        fingerprint = self.compute(script or job_script, params, record)
+        with self._lock:
+            self._current[name] = fingerprint
+            self._outputs[name] = params["output_path"]
+
+    def unchanged(self) -> set[str]:
+        # Shots whose lighting file exists and was built from exactly these inputs
+        with self._lock:
+            current = dict(self._current)
+            outputs = dict(self._outputs)
+        return {name for name, fingerprint in current.items()
+                if os.path.isfile(outputs[name]) and self.read(outputs[name]) == fingerprint}
+
+    def write(self, shot: str):
+        # Called once the shot's lighting file is built; unknown shots are ignored
+        with self._lock:
+            fingerprint = self._current.get(shot)
+            output_path = self._outputs.get(shot)
+        if fingerprint is None:
+            return
+        path = self.sidecar_path(output_path)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(fingerprint, f, indent=2)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[WARNING] Could not write the fingerprint of {shot}: {e}")
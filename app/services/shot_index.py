@@ -0,0 +1,86 @@
+import sys
+from dataclasses import dataclass
+
+from app.data.project import division_list
+from app.services.csv_manager import CSVManager
+from app.services.file_manager import FileManager
+
+REQUIRED_COLUMNS = ("EP", "SEQ", "SHOT", "START_FRAME", "END_FRAME")
+
+
+class ShotListError(ValueError):
+    def __init__(self, line: int, message: str):
+        super().__init__(f"Line {line}: {message}")
+        self.line = line
+
+
+@dataclass(frozen=True, slots=True)
+class ShotRecord:
+    ep: str
+    seq: str
+    shot: str
+    start_frame: int
+    end_frame: int
+    file_name: str  # lighting file name, the key shown in the shot lists
+    extra: tuple = ()  # values of any columns after END_FRAME, named by ShotIndex.extra_columns
+
+
+class ShotIndex:
+    # Parsed CSV rows keyed by lighting file name, built once per scan
+    def __init__(self, project_code: str, extra_columns: tuple = ()):
+        self.project_code = project_code
+        self.extra_columns = extra_columns
+        self.records = []
+        self._by_file_name = {}
+
+    @classmethod
+    def from_csv(cls, project_code: str, file_path: str) -> "ShotIndex":
+        # Streams the file; the first non-blank row is the header
+        rows = CSVManager.iter_rows(file_path)
+        header = next(rows, None)
+        extra_columns = tuple(name.strip() for name in header[1][len(REQUIRED_COLUMNS):]) if header else ()
+        index = cls(project_code, extra_columns=extra_columns)
+        for line, row in rows:
+            index.add_row(row, line=line)
+        return index
+
+    @staticmethod
+    def _parse_frame(value: str, column: str, line: int) -> int:
+        try:
+            return int(value.strip())
+        except ValueError:
+            raise ShotListError(line, f"{column} must be a whole number, got {value!r}") from None
+
+    def add_row(self, row: list, line: int = 0) -> ShotRecord:
+        # Expecting CSV format: EP, SEQ, SHOT, START_FRAME, END_FRAME[, optional columns...]
+        if len(row) < len(REQUIRED_COLUMNS):
+            raise ShotListError(line, f"expected at least {len(REQUIRED_COLUMNS)} columns "
+                                      f"({', '.join(REQUIRED_COLUMNS)}), got {len(row)}")
+        # Episode and sequence codes repeat on every row; interning shares one string per value
+        ep, seq, shot = (sys.intern(value.strip().lower()) for value in row[:3])
+        if not (ep and seq and shot):
+            raise ShotListError(line, "EP, SEQ and SHOT must not be empty")
+        start_frame = self._parse_frame(row[3], "START_FRAME", line)
+        end_frame = self._parse_frame(row[4], "END_FRAME", line)
+        if end_frame < start_frame:
+            raise ShotListError(line, f"END_FRAME {end_frame} is before START_FRAME {start_frame}")
+
+        file_name = FileManager.generate_file_name(project_code=self.project_code, ep=ep, seq=seq, shot=shot,
+                                                   division=division_list[1][0], extension="blend")
+        record = ShotRecord(ep, seq, shot, start_frame, end_frame, file_name, tuple(row[len(REQUIRED_COLUMNS):]))
+        self.records.append(record)
+        # First row wins for duplicated shots, like the old linear scan did
+        self._by_file_name.setdefault(file_name, record)
+        return record
+
+    def get(self, file_name: str) -> ShotRecord | None:
+        return self._by_file_name.get(file_name)
+
+    def __contains__(self, file_name: str) -> bool:
+        return file_name in self._by_file_name
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __len__(self) -> int:
+        return len(self.records)
@@ -0,0 +1,61 @@
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+from app.config import Config
+
+
+class StartupTimer:
+    # Wall-clock breakdown of application start, on with --startup-timing or SBBC_STARTUP_TIMING=1.
+    # Steps are collected until report(); later steps (tabs opened afterwards) print as they finish.
+    # Also appended to startup.log in the log folder, since windowed builds have no console.
+    def __init__(self, enabled: bool | None = None):
+        if enabled is None:
+            enabled = "--startup-timing" in sys.argv or os.environ.get("SBBC_STARTUP_TIMING") == "1"
+        self.enabled = enabled
+        self.start = time.perf_counter()
+        self.steps = []  # [(label, seconds), ...]
+        self._last = self.start
+        self._reported = False
+
+    def mark(self, label: str):
+        # Time since the previous mark
+        now = time.perf_counter()
+        self._add(label, now - self._last)
+        self._last = now
+
+    @contextmanager
+    def measure(self, label: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add(label, time.perf_counter() - start)
+            self._last = time.perf_counter()
+
+    def _add(self, label: str, seconds: float):
+        if not self.enabled:
+            return
+        self.steps.append((label, seconds))
+        if self._reported:
+            self._write([f"[STARTUP] {label:<40} {seconds * 1000:8.1f} ms"])
+
+    def report(self):
+        if not self.enabled or self._reported:
+            return
+        self._reported = True
+        lines = [f"[STARTUP] {label:<40} {seconds * 1000:8.1f} ms" for label, seconds in self.steps]
+        lines.append(f"[STARTUP] {'total':<40} {(time.perf_counter() - self.start) * 1000:8.1f} ms")
+        self._write(lines)
+
+    @staticmethod
+    def _write(lines: list[str]):
+        for line in lines:
+            print(line)
+        try:
+            os.makedirs(Config.LOG_PATH, exist_ok=True)
+            with open(os.path.join(Config.LOG_PATH, "startup.log"), "a", encoding="utf-8") as f:
+                f.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')}\n" + "\n".join(lines) + "\n")
+        except OSError:
+            pass
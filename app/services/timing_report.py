@@ -0,0 +1,73 @@
+import json
+import threading
+
+
+class TimingReport:
+    # Stage timings reported by the Blender scripts (see STAGE in blender_runner.py), collected
+    # for one batch from every job's output. Records arrive from the pool's worker threads.
+    def __init__(self):
+        self.records = []
+        self._lock = threading.Lock()
+
+    def add(self, job: str, record: dict):
+        # Single-shot scripts do not name their shot; the job is the shot there
+        record = {key: value for key, value in record.items() if key != "event"}
+        record["job"] = job
+        record["shot"] = record.get("shot") or job
+        with self._lock:
+            self.records.append(record)
+
+    def stage_summary(self) -> dict[str, dict]:
+        # stage -> {"count", "total", "mean", "max", "slowest_shot"} in first-seen order
+        summary = {}
+        with self._lock:
+            records = list(self.records)
+        for record in records:
+            entry = summary.setdefault(record["stage"], {"count": 0, "total": 0.0, "max": 0.0, "slowest_shot": None})
+            entry["count"] += 1
+            entry["total"] += record["seconds"]
+            if entry["slowest_shot"] is None or record["seconds"] > entry["max"]:
+                entry["max"] = record["seconds"]
+                entry["slowest_shot"] = record["shot"]
+        for entry in summary.values():
+            entry["mean"] = entry["total"] / entry["count"]
+        return summary
+
+    def shot_summary(self) -> dict[str, dict]:
+        # shot -> {"seconds", "peak_rss_mb"}; nested stages are already inside their parent's time
+        shots = {}
+        with self._lock:
+            records = list(self.records)
+        for record in records:
+            entry = shots.setdefault(record["shot"], {"seconds": 0.0, "peak_rss_mb": None})
+            if not record.get("depth"):
+                entry["seconds"] += record["seconds"]
+            rss = record.get("peak_rss_mb")
+            if rss is not None and (entry["peak_rss_mb"] is None or rss > entry["peak_rss_mb"]):
+                entry["peak_rss_mb"] = rss
+        return shots
+
+    def format(self, top: int = 10) -> str:
+        stages = self.stage_summary()
+        if not stages:
+            return "No stage timings were reported"
+        shots = self.shot_summary()
+        lines = [f"Stage timings ({len(shots)} shot(s)):",
+                 f"  {'stage':<24}{'count':>7}{'total s':>10}{'mean s':>9}{'max s':>9}  slowest shot"]
+        for name, entry in sorted(stages.items(), key=lambda item: item[1]["total"], reverse=True):
+            lines.append(f"  {name:<24}{entry['count']:>7}{entry['total']:>10.1f}{entry['mean']:>9.2f}"
+                         f"{entry['max']:>9.2f}  {entry['slowest_shot']}")
+
+        lines.append(f"Slowest shots (top {min(top, len(shots))}):")
+        for shot, entry in sorted(shots.items(), key=lambda item: item[1]["seconds"], reverse=True)[:top]:
+            rss = f"{entry['peak_rss_mb']:.0f} MB" if entry["peak_rss_mb"] is not None else "n/a"
+            lines.append(f"  {shot}: {entry['seconds']:.1f}s, peak RSS {rss}")
+        return "\n".join(lines)
+
+    def save(self, file_path: str):
+        # One JSON record per line, easy to concatenate and query across batches
+        with self._lock:
+            records = list(self.records)
+        with open(file_path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
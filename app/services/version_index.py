@@ -0,0 +1,142 @@
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config import Config
+
+# <stem>_v<digits><ext>, e.g. rmb_ep01_sq010_sh010_lgt_v012.blend
+VERSIONED_NAME = re.compile(r"^(.+)_v(\d+)(\.[^.]+)$")
+
+
+class VersionIndex:
+    # Latest version per file stem in each progress folder, built from one scandir per folder and
+    # reused while the folder's mtime is unchanged (adding or removing a file bumps it).
+    # Lookups are dict hits; only a stat is needed to revalidate a folder.
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_workers: int = 16):
+        self.max_workers = max_workers
+        self._folders = {}  # folder -> (mtime_ns, {(stem, ext): latest version})
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "VersionIndex":
+        # One index per process, so every tab and FileManager.get_latest_version share the cache
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @staticmethod
+    def _mtime(folder: str) -> int | None:
+        try:
+            return os.stat(folder).st_mtime_ns
+        except OSError:
+            return None
+
+    @staticmethod
+    def _drop_stale_reservation(path: str) -> bool:
+        # Removes a placeholder from reserve() that no job ever wrote to, once it is old enough
+        # that its run cannot still be going; returns whether it was removed
+        try:
+            stat = os.stat(path)
+            if stat.st_size != 0 or time.time() - stat.st_mtime < Config.VERSION_RESERVATION_MAX_AGE:
+                return False
+            os.remove(path)
+        except OSError:
+            return False
+        print(f"Removed stale progress version reservation {path}")
+        return True
+
+    @staticmethod
+    def _read_folder(folder: str) -> dict:
+        found = {}  # (stem, ext) -> [(version, file name), ...]
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    match = VERSIONED_NAME.match(entry.name)
+                    if match:
+                        found.setdefault((match.group(1), match.group(3)), []).append(
+                            (int(match.group(2)), entry.name))
+        except (FileNotFoundError, NotADirectoryError):
+            pass
+        latest = {}
+        for key, versions in found.items():
+            versions.sort()
+            # Only the newest file decides the next number, so only it costs a stat
+            while versions and VersionIndex._drop_stale_reservation(os.path.join(folder, versions[-1][1])):
+                versions.pop()
+            if versions:
+                latest[key] = versions[-1][0]
+        return latest
+
+    def _refresh(self, folder: str) -> dict:
+        # The mtime is read before listing, so a file added during the listing triggers a rescan next time
+        mtime = self._mtime(folder)
+        with self._lock:
+            cached = self._folders.get(folder)
+        if cached is not None and mtime is not None and cached[0] == mtime:
+            return cached[1]
+        versions = self._read_folder(folder) if mtime is not None else {}
+        with self._lock:
+            self._folders[folder] = (mtime, versions)
+        return versions
+
+    def scan(self, folders):
+        # Revalidates many folders at once; NAS round trips overlap on a thread pool
+        unique = list({os.path.normpath(folder) for folder in folders if folder})
+        if not unique:
+            return
+        workers = max(1, min(self.max_workers, len(unique)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="version-scan") as executor:
+            list(executor.map(self._refresh, unique))
+
+    def latest_version(self, folder: str, stem: str, ext: str = ".blend", refresh: bool = True) -> int:
+        # -1 when the folder holds no version of stem; refresh=False trusts the last scan()
+        folder = os.path.normpath(folder)
+        if refresh:
+            versions = self._refresh(folder)
+        else:
+            with self._lock:
+                cached = self._folders.get(folder)
+            versions = cached[1] if cached is not None else self._refresh(folder)
+        return versions.get((stem, ext), -1)
+
+    def next_version(self, folder: str, stem: str, ext: str = ".blend", refresh: bool = True) -> int:
+        return self.latest_version(folder, stem, ext, refresh=refresh) + 1
+
+    def reserve(self, folder: str, stem: str, ext: str = ".blend") -> tuple[str, int]:
+        # Claims the next free version by creating an empty placeholder with O_CREAT | O_EXCL, which
+        # only one writer can win, also across machines on NFS and SMB. A lost race moves on to the
+        # following number; no lock is shared between shots. Returns (path, version).
+        # A placeholder a crashed run left empty is dropped by a scan once it is
+        # Config.VERSION_RESERVATION_MAX_AGE old.
+        folder = os.path.normpath(folder)
+        version = self.next_version(folder, stem, ext)
+        while True:
+            path = os.path.join(folder, f"{stem}_v{version:03d}{ext}")
+            try:
+                os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666))
+            except FileExistsError:
+                version += 1
+                continue
+            with self._lock:
+                cached = self._folders.get(folder)
+                if cached is not None and version > cached[1].get((stem, ext), -1):
+                    # Keep the old mtime, so the next refresh still rescans for other writers' files
+                    cached[1][(stem, ext)] = version
+            return path, version
+
+    @staticmethod
+    def release(path: str) -> bool:
+        # Drops a reservation nothing was written to; a saved version is never removed
+        try:
+            if os.path.getsize(path) == 0:
+                os.remove(path)
+                return True
+        except OSError:
+            pass
+        return False
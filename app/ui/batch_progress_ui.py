@@ -0,0 +1,64 @@
+# Form implementation generated from reading ui file 'app/ui/batch_progress.ui'
+#
+# Created by: PyQt6 UI code generator 6.4.2
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic6 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt6 import QtCore, QtGui, QtWidgets
+
+
+class Ui_Form(object):
+    def setupUi(self, Form):
+        Form.setObjectName("Form")
+        Form.resize(560, 420)
+        self.gridLayout = QtWidgets.QGridLayout(Form)
+        self.gridLayout.setObjectName("gridLayout")
+        self.label_summary = QtWidgets.QLabel(parent=Form)
+        self.label_summary.setObjectName("label_summary")
+        self.gridLayout.addWidget(self.label_summary, 0, 0, 1, 1)
+        self.progressBar = QtWidgets.QProgressBar(parent=Form)
+        self.progressBar.setProperty("value", 0)
+        self.progressBar.setObjectName("progressBar")
+        self.gridLayout.addWidget(self.progressBar, 1, 0, 1, 1)
+        self.tableWidget_jobs = QtWidgets.QTableWidget(parent=Form)
+        self.tableWidget_jobs.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.tableWidget_jobs.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
+        self.tableWidget_jobs.setObjectName("tableWidget_jobs")
+        self.tableWidget_jobs.setColumnCount(3)
+        self.tableWidget_jobs.setRowCount(0)
+        item = QtWidgets.QTableWidgetItem()
+        self.tableWidget_jobs.setHorizontalHeaderItem(0, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.tableWidget_jobs.setHorizontalHeaderItem(1, item)
+        item = QtWidgets.QTableWidgetItem()
+        self.tableWidget_jobs.setHorizontalHeaderItem(2, item)
+        self.tableWidget_jobs.horizontalHeader().setStretchLastSection(True)
+        self.tableWidget_jobs.verticalHeader().setVisible(False)
+        self.gridLayout.addWidget(self.tableWidget_jobs, 2, 0, 1, 1)
+        self.gridLayout_buttons = QtWidgets.QGridLayout()
+        self.gridLayout_buttons.setObjectName("gridLayout_buttons")
+        self.pushButton_cancel = QtWidgets.QPushButton(parent=Form)
+        self.pushButton_cancel.setObjectName("pushButton_cancel")
+        self.gridLayout_buttons.addWidget(self.pushButton_cancel, 0, 0, 1, 1)
+        self.pushButton_close = QtWidgets.QPushButton(parent=Form)
+        self.pushButton_close.setObjectName("pushButton_close")
+        self.gridLayout_buttons.addWidget(self.pushButton_close, 0, 1, 1, 1)
+        self.gridLayout.addLayout(self.gridLayout_buttons, 3, 0, 1, 1)
+
+        self.retranslateUi(Form)
+        QtCore.QMetaObject.connectSlotsByName(Form)
+
+    def retranslateUi(self, Form):
+        _translate = QtCore.QCoreApplication.translate
+        Form.setWindowTitle(_translate("Form", "Batch Progress"))
+        self.label_summary.setText(_translate("Form", "Waiting…"))
+        item = self.tableWidget_jobs.horizontalHeaderItem(0)
+        item.setText(_translate("Form", "Shot"))
+        item = self.tableWidget_jobs.horizontalHeaderItem(1)
+        item.setText(_translate("Form", "State"))
+        item = self.tableWidget_jobs.horizontalHeaderItem(2)
+        item.setText(_translate("Form", "Elapsed"))
+        self.pushButton_cancel.setText(_translate("Form", "Cancel"))
+        self.pushButton_close.setText(_translate("Form", "Close"))
@@ -106,6 +106,57 @@ class Ui_Form(object):
         self.toolButton_lightingPresetBlend.setObjectName("toolButton_lightingPresetBlend")
         self.gridLayout_lighting.addWidget(self.toolButton_lightingPresetBlend, 2, 1, 1, 1)
         self.gridLayout_data.addLayout(self.gridLayout_lighting, 2, 1, 2, 1)
+        self.gridLayout_run = QtWidgets.QGridLayout()
+        self.gridLayout_run.setObjectName("gridLayout_run")
+        self.label_run = QtWidgets.QLabel(parent=Form)
+        self.label_run.setObjectName("label_run")
+        self.gridLayout_run.addWidget(self.label_run, 0, 0, 1, 4)
+        self.label_workers = QtWidgets.QLabel(parent=Form)
+        self.label_workers.setObjectName("label_workers")
+        self.gridLayout_run.addWidget(self.label_workers, 1, 0, 1, 1)
+        self.spinBox_workers = QtWidgets.QSpinBox(parent=Form)
+        self.spinBox_workers.setMaximum(64)
+        self.spinBox_workers.setObjectName("spinBox_workers")
+        self.gridLayout_run.addWidget(self.spinBox_workers, 1, 1, 1, 1)
+        self.label_retries = QtWidgets.QLabel(parent=Form)
+        self.label_retries.setObjectName("label_retries")
+        self.gridLayout_run.addWidget(self.label_retries, 1, 2, 1, 1)
+        self.spinBox_retries = QtWidgets.QSpinBox(parent=Form)
+        self.spinBox_retries.setMaximum(10)
+        self.spinBox_retries.setObjectName("spinBox_retries")
+        self.gridLayout_run.addWidget(self.spinBox_retries, 1, 3, 1, 1)
+        self.label_timeout = QtWidgets.QLabel(parent=Form)
+        self.label_timeout.setObjectName("label_timeout")
+        self.gridLayout_run.addWidget(self.label_timeout, 2, 0, 1, 1)
+        self.spinBox_timeout = QtWidgets.QSpinBox(parent=Form)
+        self.spinBox_timeout.setMaximum(86400)
+        self.spinBox_timeout.setSingleStep(60)
+        self.spinBox_timeout.setObjectName("spinBox_timeout")
+        self.gridLayout_run.addWidget(self.spinBox_timeout, 2, 1, 1, 1)
+        self.label_retryBackoff = QtWidgets.QLabel(parent=Form)
+        self.label_retryBackoff.setObjectName("label_retryBackoff")
+        self.gridLayout_run.addWidget(self.label_retryBackoff, 2, 2, 1, 1)
+        self.doubleSpinBox_retryBackoff = QtWidgets.QDoubleSpinBox(parent=Form)
+        self.doubleSpinBox_retryBackoff.setDecimals(1)
+        self.doubleSpinBox_retryBackoff.setMaximum(3600.0)
+        self.doubleSpinBox_retryBackoff.setObjectName("doubleSpinBox_retryBackoff")
+        self.gridLayout_run.addWidget(self.doubleSpinBox_retryBackoff, 2, 3, 1, 1)
+        self.label_progressCopy = QtWidgets.QLabel(parent=Form)
+        self.label_progressCopy.setObjectName("label_progressCopy")
+        self.gridLayout_run.addWidget(self.label_progressCopy, 3, 0, 1, 1)
+        self.comboBox_progressCopy = QtWidgets.QComboBox(parent=Form)
+        self.comboBox_progressCopy.setObjectName("comboBox_progressCopy")
+        self.gridLayout_run.addWidget(self.comboBox_progressCopy, 3, 1, 1, 1)
+        self.checkBox_persistent = QtWidgets.QCheckBox(parent=Form)
+        self.checkBox_persistent.setObjectName("checkBox_persistent")
+        self.gridLayout_run.addWidget(self.checkBox_persistent, 3, 2, 1, 2)
+        self.checkBox_batch = QtWidgets.QCheckBox(parent=Form)
+        self.checkBox_batch.setObjectName("checkBox_batch")
+        self.gridLayout_run.addWidget(self.checkBox_batch, 4, 0, 1, 2)
+        self.checkBox_onlyChanged = QtWidgets.QCheckBox(parent=Form)
+        self.checkBox_onlyChanged.setObjectName("checkBox_onlyChanged")
+        self.gridLayout_run.addWidget(self.checkBox_onlyChanged, 4, 2, 1, 2)
+        self.gridLayout_data.addLayout(self.gridLayout_run, 4, 0, 1, 2)
         self.gridLayout.addLayout(self.gridLayout_data, 0, 0, 1, 1)
         self.gridLayout_list = QtWidgets.QGridLayout()
         self.gridLayout_list.setObjectName("gridLayout_list")
@@ -122,12 +173,12 @@ class Ui_Form(object):
         spacerItem1 = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Policy.Minimum, QtWidgets.QSizePolicy.Policy.Expanding)
         self.gridLayout_listControl.addItem(spacerItem1, 0, 0, 1, 1)
         self.gridLayout_list.addLayout(self.gridLayout_listControl, 1, 1, 1, 1)
-        self.listWidget_available = QtWidgets.QListWidget(parent=Form)
-        self.listWidget_available.setObjectName("listWidget_available")
-        self.gridLayout_list.addWidget(self.listWidget_available, 1, 0, 1, 1)
-        self.listWidget_selected = QtWidgets.QListWidget(parent=Form)
-        self.listWidget_selected.setObjectName("listWidget_selected")
-        self.gridLayout_list.addWidget(self.listWidget_selected, 1, 2, 1, 1)
+        self.listView_available = QtWidgets.QListView(parent=Form)
+        self.listView_available.setObjectName("listView_available")
+        self.gridLayout_list.addWidget(self.listView_available, 1, 0, 1, 1)
+        self.listView_selected = QtWidgets.QListView(parent=Form)
+        self.listView_selected.setObjectName("listView_selected")
+        self.gridLayout_list.addWidget(self.listView_selected, 1, 2, 1, 1)
         self.gridLayout.addLayout(self.gridLayout_list, 1, 0, 1, 1)
         self.gridLayout_generate = QtWidgets.QGridLayout()
         self.gridLayout_generate.setObjectName("gridLayout_generate")
@@ -166,6 +217,19 @@ class Ui_Form(object):
         self.label_lighting.setText(_translate("Form", "Lighting"))
         self.lineEdit_lightingPresetBlend.setPlaceholderText(_translate("Form", "blend preset"))
         self.toolButton_lightingPresetBlend.setText(_translate("Form", "Locate"))
+        self.label_run.setText(_translate("Form", "Run"))
+        self.label_workers.setText(_translate("Form", "Workers"))
+        self.spinBox_workers.setSpecialValueText(_translate("Form", "Auto"))
+        self.label_retries.setText(_translate("Form", "Retries"))
+        self.label_timeout.setText(_translate("Form", "Timeout"))
+        self.spinBox_timeout.setSpecialValueText(_translate("Form", "None"))
+        self.spinBox_timeout.setSuffix(_translate("Form", " s"))
+        self.label_retryBackoff.setText(_translate("Form", "Retry delay"))
+        self.doubleSpinBox_retryBackoff.setSuffix(_translate("Form", " s"))
+        self.label_progressCopy.setText(_translate("Form", "Progress version"))
+        self.checkBox_persistent.setText(_translate("Form", "Persistent workers"))
+        self.checkBox_batch.setText(_translate("Form", "Batch shots per session"))
+        self.checkBox_onlyChanged.setText(_translate("Form", "Only changed shots"))
         self.pushButton_listControl_add.setText(_translate("Form", ">"))
         self.pushButton_listControl_remove.setText(_translate("Form", "<"))
         self.pushButton_generate_scan.setText(_translate("Form", "Scan"))
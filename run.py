@@ -2,4 +2,4 @@ import subprocess
 import sys
 
 if __name__ == "__main__":
-    subprocess.run([sys.executable, "-m", "app.main"])
\ No newline at end of file
+    subprocess.run([sys.executable, "-m", "app.main", *sys.argv[1:]])
\ No newline at end of file
@@ -0,0 +1,45 @@
+from app.services.blender_pool import BlenderPool
+
+
+def _shot(name):
+    return {"name": name, "output_path": f"/out/{name}.blend", "output_path_progress": f"/out/progress/{name}.blend"}
+
+
+def test_batch_retry_keeps_only_the_shots_with_missing_outputs():
+    params = {"master_file": "/master.blend", "shots": [_shot("sh010"), _shot("sh020"), _shot("sh030")]}
+    stale = {"/out/progress/sh020.blend"}
+
+    retry = BlenderPool._retry_params("Batch 1/1", params, stale)
+
+    assert [shot["name"] for shot in retry["shots"]] == ["sh020"]
+    assert retry["master_file"] == "/master.blend"
+    assert len(params["shots"]) == 3
+
+
+def test_batch_retry_stops_when_every_output_was_written():
+    params = {"shots": [_shot("sh010"), _shot("sh020")]}
+
+    assert BlenderPool._retry_params("Batch 1/1", params, set()) is None
+
+
+def test_preset_job_is_not_retried_once_its_lighting_file_was_saved():
+    params = dict(_shot("sh010"), master_file="/out/sh010.blend", json_preset_filepath="/preset.json")
+
+    assert BlenderPool._retry_params("sh010", params, {"/out/progress/sh010.blend"}) is None
+    assert BlenderPool._retry_params("sh010", params, {"/out/sh010.blend", "/out/progress/sh010.blend"}) is params
+
+
+def test_preset_batch_retries_only_shots_whose_lighting_file_is_untouched():
+    params = {"json_preset_filepath": "/preset.json", "shots": [_shot("sh010"), _shot("sh020")]}
+    stale = {"/out/progress/sh010.blend", "/out/sh020.blend", "/out/progress/sh020.blend"}
+
+    retry = BlenderPool._retry_params("Batch 1/1", params, stale)
+
+    assert [shot["name"] for shot in retry["shots"]] == ["sh020"]
+
+
+def test_plain_lighting_job_is_retried_after_its_lighting_file_was_saved():
+    # It starts again from the mastershot, so a rerun does not build on the saved file
+    params = dict(_shot("sh010"), master_file="/master.blend")
+
+    assert BlenderPool._retry_params("sh010", params, {"/out/progress/sh010.blend"}) is params
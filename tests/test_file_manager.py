@@ -0,0 +1,57 @@
+import errno
+import os
+
+import pytest
+
+from app.services.file_manager import FileManager
+
+
+def _corrupt_copy(src, dst):
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        fdst.write(fsrc.read()[:-1])
+
+
+@pytest.fixture
+def src(tmp_path):
+    path = tmp_path / "sh010_lgt.blend"
+    path.write_bytes(os.urandom(64 * 1024))
+    return path
+
+
+@pytest.mark.parametrize("mode", ["copy", "reflink"])
+def test_copy_file_writes_an_identical_file(tmp_path, src, mode):
+    dst = tmp_path / "progress" / "sh010_lgt_v001.blend"
+    dst.parent.mkdir()
+
+    assert FileManager.copy_file(str(src), str(dst), mode=mode) in ("copy", "reflink")
+    assert dst.read_bytes() == src.read_bytes()
+    assert os.listdir(dst.parent) == [dst.name]
+
+
+@pytest.mark.parametrize("reserved", [False, True])
+def test_copy_file_checksum_mismatch_leaves_no_partial_destination(tmp_path, src, monkeypatch, reserved):
+    dst = tmp_path / "progress" / "sh010_lgt_v001.blend"
+    dst.parent.mkdir()
+    if reserved:
+        dst.touch()  # the placeholder VersionIndex.reserve leaves
+    monkeypatch.setattr(FileManager, "_copy_contents", staticmethod(_corrupt_copy))
+
+    with pytest.raises(OSError) as excinfo:
+        FileManager.copy_file(str(src), str(dst), mode="copy")
+
+    assert excinfo.value.errno == errno.EIO
+    if reserved:
+        assert dst.read_bytes() == b""
+        assert os.listdir(dst.parent) == [dst.name]
+    else:
+        assert os.listdir(dst.parent) == []
+
+
+def test_copy_file_hardlink_shares_the_source(tmp_path, src):
+    dst = tmp_path / "sh010_lgt_v001.blend"
+
+    used = FileManager.copy_file(str(src), str(dst), mode="hardlink")
+
+    assert dst.read_bytes() == src.read_bytes()
+    if used == "hardlink":
+        assert os.path.samefile(src, dst)
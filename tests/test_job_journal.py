@@ -0,0 +1,129 @@
+import json
+import os
+
+import pytest
+
+from app.services.job_journal import STATUS_DONE, STATUS_FAILED, JobJournal
+from app.services.shot_builder import ShotBuilder
+
+
+def _touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write("blend")
+
+
+@pytest.fixture
+def project(tmp_path):
+    master = str(tmp_path / "master.blend")
+    preset_blend = str(tmp_path / "preset" / "light.blend")
+    preset_json = str(tmp_path / "preset" / "light.json")
+    for path in (master, preset_blend, preset_json):
+        _touch(path)
+    shots = []
+    for number in ("010", "020", "030"):
+        name = f"rmb_ep01_sq010_sh{number}_lgt.blend"
+        shot_dir = tmp_path / "lighting" / f"sh{number}"
+        shot = {
+            "name": name,
+            "animation_file": str(tmp_path / "animation" / f"rmb_ep01_sq010_sh{number}_anm.blend"),
+            "start_frame": 1,
+            "end_frame": 24,
+            "output_path": str(shot_dir / name),
+            "output_path_progress": str(shot_dir / "progress" / name.replace(".blend", "_v000.blend")),
+            "output_node": [("comp", str(tmp_path / "comp" / number), "comp_"),
+                            ("preview", str(tmp_path / "preview" / number), "preview_")],
+        }
+        _touch(shot["animation_file"])
+        shots.append(shot)
+    return {"master": master, "preset_blend": preset_blend, "preset_json": preset_json, "shots": shots,
+            "journal": str(tmp_path / "journal.jsonl")}
+
+
+def _run_batch(project, apply_preset, workers=2, status=STATUS_DONE):
+    # What the pool does for a batch run: the script writes every output, then the journal records the job
+    journal = JobJournal(path=project["journal"])
+    jobs = ShotBuilder.batch_jobs(project["shots"], workers=workers, mastershot_path=project["master"], link=True,
+                                  apply_preset=apply_preset, blend_preset_filepath=project["preset_blend"],
+                                  json_preset_filepath=project["preset_json"])
+    for name, script, params in jobs:
+        for shot in params["shots"]:
+            _touch(shot["output_path"])
+            _touch(shot["output_path_progress"])
+        journal.record(name, script, params, status)
+
+
+def _probe_jobs(project, apply_preset):
+    # The single-shot jobs the CLI and the generator tab compare with the journal on --resume
+    return [ShotBuilder.lighting_job(shot, mastershot_path=project["master"], link=True, apply_preset=apply_preset,
+                                     blend_preset_filepath=project["preset_blend"],
+                                     json_preset_filepath=project["preset_json"])
+            for shot in project["shots"]]
+
+
+@pytest.mark.parametrize("apply_preset", [False, True])
+def test_resume_skips_shots_of_a_finished_batch(project, apply_preset):
+    _run_batch(project, apply_preset)
+
+    journal = JobJournal(path=project["journal"])
+    assert journal.completed(_probe_jobs(project, apply_preset)) == {shot["name"] for shot in project["shots"]}
+
+
+def test_resume_reruns_batch_shots_after_the_settings_change(project):
+    _run_batch(project, apply_preset=False)
+
+    journal = JobJournal(path=project["journal"])
+    assert journal.completed(_probe_jobs(project, apply_preset=True)) == set()
+
+
+def test_resume_reruns_batch_shots_whose_input_changed(project):
+    _run_batch(project, apply_preset=False)
+    changed = project["shots"][1]
+    stat = os.stat(changed["animation_file"])
+    os.utime(changed["animation_file"], ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    journal = JobJournal(path=project["journal"])
+    expected = {shot["name"] for shot in project["shots"]} - {changed["name"]}
+    assert journal.completed(_probe_jobs(project, apply_preset=False)) == expected
+
+
+def test_resume_reruns_a_failed_batch_when_outputs_are_missing(project):
+    _run_batch(project, apply_preset=False, workers=1, status=STATUS_FAILED)
+    os.remove(project["shots"][0]["output_path"])
+
+    journal = JobJournal(path=project["journal"])
+    assert project["shots"][0]["name"] not in journal.completed(_probe_jobs(project, apply_preset=False))
+
+
+def test_failed_shot_keeps_its_params_for_a_replay(project):
+    name, script, params = ShotBuilder.batch_jobs(project["shots"], workers=1, mastershot_path=project["master"],
+                                                  link=True, apply_preset=True,
+                                                  blend_preset_filepath=project["preset_blend"],
+                                                  json_preset_filepath=project["preset_json"])[0]
+    JobJournal(path=project["journal"]).record(name, script, params, STATUS_FAILED,
+                                               stale_outputs=[project["shots"][0]["output_path"]])
+
+    entry = JobJournal(path=project["journal"])._latest[f"lighting:{project['shots'][0]['name']}"]
+    assert entry["status"] == STATUS_FAILED
+    assert (entry["job"], entry["script"]) == (name, script)
+    assert entry["params"]["animation_file"] == project["shots"][0]["animation_file"]
+    assert entry["params"]["json_preset_filepath"] == project["preset_json"]
+    assert "shots" not in entry["params"]
+
+
+def test_compaction_keeps_lines_another_run_appended(project, monkeypatch):
+    writer = JobJournal(path=project["journal"])
+    for _ in range(400):
+        writer.record("rmb_ep01_sq010_sh010_lgt.blend", "blender_script.py", project["shots"][0], STATUS_DONE)
+    monkeypatch.setattr(JobJournal, "_compact", lambda self: None)
+    journal = JobJournal(path=project["journal"])
+    # Another run appends after this one loaded the journal, before it compacts
+    JobJournal(path=project["journal"]).record("rmb_ep01_sq010_sh020_lgt.blend", "blender_script.py",
+                                               project["shots"][1], STATUS_DONE)
+    monkeypatch.undo()
+    journal._compact()
+
+    with open(project["journal"], encoding="utf-8") as f:
+        keys = [json.loads(line)["key"] for line in f]
+    assert keys == ["lighting:rmb_ep01_sq010_sh010_lgt.blend", "lighting:rmb_ep01_sq010_sh020_lgt.blend"]
+    assert "lighting:rmb_ep01_sq010_sh020_lgt.blend" in journal._latest
@@ -0,0 +1,75 @@
+import os
+import stat
+
+from app.services.preflight import DIRECTORY, FILE, Preflight
+from app.services.shot_builder import ShotBuilder
+
+
+def _shot(tmp_path, number, animation=True):
+    name = f"rmb_ep01_sq010_sh{number}_lgt.blend"
+    animation_file = tmp_path / "animation" / f"rmb_ep01_sq010_sh{number}_anm.blend"
+    if animation:
+        animation_file.parent.mkdir(exist_ok=True)
+        animation_file.write_bytes(b"blend")
+    shot_dir = tmp_path / "lighting" / f"sh{number}"
+    return {
+        "name": name,
+        "animation_file": str(animation_file),
+        "output_path": str(shot_dir / name),
+        "output_path_progress": str(shot_dir / "progress" / name),
+        "output_node": [("comp", str(tmp_path / "comp" / number), "comp_")],
+    }
+
+
+def _blender(tmp_path):
+    path = tmp_path / "blender"
+    path.write_text("#!/bin/sh\n")
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return str(path)
+
+
+def test_reports_missing_inputs_per_shot_and_for_the_batch(tmp_path):
+    shots = [_shot(tmp_path, "010"), _shot(tmp_path, "020", animation=False)]
+    missing_master = str(tmp_path / "master.blend")
+
+    report = Preflight().run(ShotBuilder.batch_preflight(_blender(tmp_path), mastershot_path=missing_master),
+                             {shot["name"]: ShotBuilder.lighting_preflight(shot) for shot in shots})
+
+    assert not report.ok
+    assert report.batch_problems == [f"Mastershot file not found: {missing_master}"]
+    assert report.shot_problems == {shots[1]["name"]: [f"Animation file not found: {shots[1]['animation_file']}"]}
+    assert shots[1]["name"] in report.format()
+
+
+def test_output_folders_may_not_exist_yet(tmp_path):
+    shot = _shot(tmp_path, "010")
+    master = tmp_path / "master.blend"
+    master.write_bytes(b"blend")
+
+    report = Preflight().run(ShotBuilder.batch_preflight(_blender(tmp_path), mastershot_path=str(master)),
+                             {shot["name"]: ShotBuilder.lighting_preflight(shot)})
+
+    assert report.ok
+    assert not os.path.exists(os.path.dirname(shot["output_path"]))
+
+
+def test_check_path_reasons(tmp_path):
+    folder = tmp_path / "folder"
+    folder.mkdir()
+
+    assert Preflight.check_path(FILE, "") == "path is empty"
+    assert Preflight.check_path(FILE, str(folder)) == f"not found: {folder}"
+    assert Preflight.check_path(DIRECTORY, str(folder / "new" / "deeper")) is None
+    blocker = tmp_path / "file"
+    blocker.write_bytes(b"")
+    assert Preflight.check_path(DIRECTORY, str(blocker / "sub")) == f"not a folder: {blocker}"
+
+
+def test_format_limits_the_number_of_shots(tmp_path):
+    missing = {f"sh{number:03d}": [("Animation file", FILE, str(tmp_path / f"{number}.blend"))]
+               for number in range(5)}
+
+    text = Preflight().run([], missing).format(max_shots=2)
+
+    assert text.count("Animation file not found") == 2
+    assert text.endswith("... and 3 more shot(s)")
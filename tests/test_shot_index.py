@@ -0,0 +1,38 @@
+import pytest
+
+from app.services.shot_index import ShotIndex, ShotListError
+
+
+def _csv(tmp_path, *rows):
+    path = tmp_path / "shots.csv"
+    path.write_text("\n".join(["EP,SEQ,SHOT,START_FRAME,END_FRAME,NOTES", *rows]) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def test_reads_records_and_extra_columns(tmp_path):
+    index = ShotIndex.from_csv("Rimba", _csv(tmp_path, "EP01,SQ010,SH010,1001,1024,hero", "", "ep01,sq010,sh020,1,12"))
+
+    assert len(index) == 2
+    first = next(iter(index))
+    assert (first.ep, first.seq, first.shot, first.start_frame, first.end_frame) == ("ep01", "sq010", "sh010", 1001, 1024)
+    assert index.extra_columns == ("NOTES",)
+    assert first.extra == ("hero",)
+    assert first.file_name in index
+    assert index.get(first.file_name) is first
+
+
+@pytest.mark.parametrize("row, message", [
+    ("ep01,sq010,sh010,1001", "expected at least 5 columns"),
+    ("ep01,,sh010,1001,1024", "must not be empty"),
+    ("ep01,sq010,sh010,first,1024", "START_FRAME must be a whole number"),
+    ("ep01,sq010,sh010,1001,1024.5", "END_FRAME must be a whole number"),
+    ("ep01,sq010,sh010,1024,1001", "END_FRAME 1001 is before START_FRAME 1024"),
+])
+def test_rejects_bad_records_with_their_line(tmp_path, row, message):
+    path = _csv(tmp_path, "ep01,sq010,sh005,1,10", row)
+
+    with pytest.raises(ShotListError, match=message) as excinfo:
+        ShotIndex.from_csv("Rimba", path)
+
+    assert excinfo.value.line == 3
+    assert str(excinfo.value).startswith("Line 3: ")
@@ -0,0 +1,50 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config import Config
+from app.services.version_index import VersionIndex
+
+STEM = "rmb_ep01_sq010_sh010_lgt"
+
+
+def test_concurrent_reserve_gives_every_caller_its_own_version(tmp_path):
+    # One index per caller, like separate runs that share the progress folder
+    open(tmp_path / f"{STEM}_v003.blend", "wb").close()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        reserved = list(executor.map(lambda _: VersionIndex().reserve(str(tmp_path), STEM), range(32)))
+
+    versions = sorted(version for _, version in reserved)
+    assert versions == list(range(4, 36))
+    assert all(os.path.isfile(path) for path, _ in reserved)
+
+
+def test_shared_index_reserves_distinct_versions(tmp_path):
+    index = VersionIndex()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        reserved = list(executor.map(lambda _: index.reserve(str(tmp_path), STEM), range(16)))
+
+    assert len({version for _, version in reserved}) == 16
+    assert index.next_version(str(tmp_path), STEM) == 16
+
+
+def test_stale_empty_reservation_is_dropped(tmp_path):
+    saved = tmp_path / f"{STEM}_v001.blend"
+    saved.write_bytes(b"blend")
+    stale = tmp_path / f"{STEM}_v002.blend"
+    stale.touch()
+    old = time.time() - Config.VERSION_RESERVATION_MAX_AGE - 60
+    os.utime(stale, (old, old))
+
+    assert VersionIndex().next_version(str(tmp_path), STEM) == 2
+    assert not stale.exists()
+    assert saved.exists()
+
+
+def test_fresh_reservation_is_kept(tmp_path):
+    path, version = VersionIndex().reserve(str(tmp_path), STEM)
+
+    assert VersionIndex().next_version(str(tmp_path), STEM) == version + 1
+    assert os.path.exists(path)
+    assert VersionIndex.release(path)
+    assert not os.path.exists(path)